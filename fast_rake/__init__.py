@@ -20,4 +20,4 @@
 # OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
 # WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
 from fast_rake import _rake
-from fast_rake._rake import Rake
+from fast_rake._rake import MultiRake, Rake
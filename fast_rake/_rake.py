@@ -24,14 +24,19 @@ import numbers
 import operator
 import re
 import warnings
-from typing import List, Iterable
+from typing import List, Iterable, Mapping, Optional, Pattern, Tuple
 
+import fast_rake.normalize as norm
 import fast_rake.optimized_stop_list as stops
 import fast_rake.rake_alg as alg
 import fast_rake.version as v
+from fast_rake.cache import SentenceCache
+from fast_rake.result import KeywordList
 
 logger = logging.getLogger(__name__)
 
+_NON_BLANK_B = re.compile(rb"\S")
+
 
 class Rake:
     """
@@ -42,6 +47,12 @@ class Rake:
     The algorithm is implemented using `__call__` with a non-empty string
     (the document) as it's only argument.
 
+    The stopword regex is compiled on the first call (or by `precompile()`)
+    and is shared by all instances having the same stopword configuration.
+
+    An instance holds no per-call state and can be shared between threads;
+    see `fast_rake.parallel` for thread and process pool batch modes.
+
      Args:
          stopword_name (str): one of ("google", "nltk", "sklearn", "smart");
             Default: "smart"
@@ -59,6 +70,40 @@ class Rake:
             If None, max_kw is used NB: max_kw cannot be None in this case;
             Default: 1.0
 
+        kw_only (bool): if True, return only the keywords without scores;
+            Default: False
+
+        idf_index (fast_rake.idf.IdfIndex|None): document frequency index
+            used to down-weight phrases common across a corpus; Default: None
+
+        idf_weight (float): blend between plain RAKE scores (0.0) and scores
+            multiplied by the phrase IDF (1.0); Default: 1.0
+
+        merge_variants (bool): if True, candidates differing only in case or
+            plural form are merged before ranking; Default: False
+
+        sentence_cache (int|None): if given, the candidate phrases of up to
+            this many recently seen sentences are cached, so repeated
+            sentences skip the stopword regex; see `cache_info()`;
+            Default: None
+
+        stopword_overlay (bool): if True, `custom_stopwords` are compiled
+            into a small pattern of their own and matched within the
+            candidates found by the built-in list, which is compiled once
+            and shared, instead of compiling a combined regex for this
+            instance. Each custom stopword must be a single token;
+            Default: False
+
+        backend (str): "serial", or "auto" to send documents long enough to
+            benefit to `parallel.extract_document`, based on timings
+            measured on first use or loaded from a saved profile; see
+            `fast_rake.backend` and `backend_info()`; Default: "serial"
+
+        compact (bool): if True, `__call__` returns a
+            `fast_rake.result.KeywordList`, which stores offsets into the
+            input and array-backed scores instead of a list of tuples;
+            Default: False
+
     Raises:
         ValueError if arguments are incorrect
 
@@ -97,6 +142,13 @@ class Rake:
         ngram_range: tuple = None,
         top_percent: float = 1.0,
         kw_only: bool = False,
+        idf_index=None,
+        idf_weight: float = 1.0,
+        merge_variants: bool = False,
+        sentence_cache: int = None,
+        stopword_overlay: bool = False,
+        backend: str = "serial",
+        compact: bool = False,
     ) -> None:
 
         self.supported_stopwords = ("google", "nltk", "sklearn", "smart")
@@ -107,12 +159,15 @@ class Rake:
         self._checkargs(
             stopword_name, custom_stopwords, max_kw, ngram_range, top_percent
         )
+        if not 0.0 <= idf_weight <= 1.0:
+            msg = f"idf_weight must be in [0, 1], got {idf_weight}"
+            raise ValueError(msg)
+        if backend not in ("serial", "auto"):
+            msg = f"backend must be 'serial' or 'auto', got {backend}"
+            raise ValueError(msg)
 
-        self._stop_words_re = stops.load_stopwords(
-            stopword_name,
-            custom_stopwords,
-            no_trailing=True,
-        )
+        # the stopword regex is compiled on first use; see `precompile()`
+        self._stop_re = None
         logger.info(f"stopword_name : {stopword_name}")
         if custom_stopwords:
             logger.info(
@@ -125,20 +180,136 @@ class Rake:
         self.top_percent = top_percent
         self.stop_words = stopword_name
         self.custom_stopwords = custom_stopwords
+        self.stopword_overlay = stopword_overlay
+        # like the stopword regex, overlays are compiled on first use
+        self._overlay_re = None
+        self._overlay_re_b = None
+        if stopword_overlay and custom_stopwords:
+            if any(len(c.split()) > 1 for c in custom_stopwords):
+                raise ValueError("overlay stopwords must be single tokens")
+        self.idf_index = idf_index
+        self.idf_weight = idf_weight
+        self.merge_variants = merge_variants
+        self.sentence_cache = None
+        if sentence_cache is not None:
+            self.sentence_cache = SentenceCache(sentence_cache)
+        self.backend = None
+        if backend == "auto":
+            # keeps the process-pool modules out of `import fast_rake`
+            from fast_rake.backend import AutoBackend
+
+            self.backend = AutoBackend()
+        self.compact = compact
 
         # be faithful to the original implementation
         self._word_splitter = re.compile("[^a-zA-Z0-9_\\+\\-/]")
         self._sentence_splitter = re.compile(
             "[.!?,;:\t\\\\\"\\(\\)\\'\u2019\u2013]|\\s\\-\\s"
         )
+        # the same splitters for UTF-8 input; see `__call__`
+        self._word_splitter_b = re.compile(b"[^a-zA-Z0-9_\\+\\-/]")
+        self._sentence_splitter_b = re.compile(
+            b"[.!?,;:\t\\\\\"\\(\\)\\']|\\s\\-\\s|"
+            + "\u2019|\u2013".encode("utf-8")
+        )
+        self._stop_re_b = None
+
+    @property
+    def _stop_words_re(self) -> Pattern:
+        if self._stop_re is None:
+            self._stop_re = stops.load_stopwords(
+                self.stop_words,
+                self._regex_customs,
+                no_trailing=True,
+            )
+        return self._stop_re
+
+    @property
+    def _stop_words_re_b(self) -> Pattern:
+        if self._stop_re_b is None:
+            self._stop_re_b = stops.load_stopwords(
+                self.stop_words,
+                self._regex_customs,
+                no_trailing=True,
+                as_bytes=True,
+            )
+        return self._stop_re_b
+
+    @property
+    def _overlay(self) -> Optional[Pattern]:
+        if self._overlay_re is None and self._has_overlay:
+            self._overlay_re = stops.compile_overlay(self.custom_stopwords)
+        return self._overlay_re
+
+    @property
+    def _overlay_b(self) -> Optional[Pattern]:
+        if self._overlay_re_b is None and self._has_overlay:
+            self._overlay_re_b = stops.compile_overlay(
+                self.custom_stopwords, as_bytes=True
+            )
+        return self._overlay_re_b
+
+    @property
+    def _has_overlay(self) -> bool:
+        return bool(self.stopword_overlay and self.custom_stopwords)
+
+    def cache_info(self) -> dict:
+        """
+        Hit and miss counts of the sentence cache.
+
+        Returns:
+            dict: empty if `sentence_cache` is None
+        """
+        if self.sentence_cache is None:
+            return dict()
+        return self.sentence_cache.info()
+
+    def backend_info(self) -> dict:
+        """
+        Cost models, length threshold, and routing counts of the automatic
+        backend.
+
+        Returns:
+            dict: empty if `backend` is "serial"
+        """
+        if self.backend is None:
+            return dict()
+        return self.backend.info()
+
+    @property
+    def _regex_customs(self) -> List:
+        return None if self.stopword_overlay else self.custom_stopwords
+
+    @property
+    def _stop_key(self) -> tuple:
+        customs = tuple(self.custom_stopwords or ())
+        return self.stop_words, customs, self.stopword_overlay
+
+    def precompile(self) -> "Rake":
+        """
+        Compile the stopword regex now rather than on the first call. This
+        is useful for warming long-lived workers before they take traffic.
+
+        Returns:
+            Rake: this instance
+        """
+        _ = self._stop_words_re
+        _ = self._overlay
+        return self
 
     def __call__(self, input_text: str) -> Iterable:
         """
         Extract and rank the keywords from `input_text`.
 
+        UTF-8 encoded `bytes`, `bytearray`, or `memoryview` input is
+        processed without decoding and the keywords are returned as `bytes`.
+        In this case case-insensitive stopword matching and word boundaries
+        are ASCII-only, so text adjacent to non-ASCII letters may split
+        differently than the decoded `str`.
+
         Args:
-            input_text (str): Text from which keywords will be extracted and
-                ranked.
+            input_text (str|bytes): Text from which keywords will be
+                extracted and ranked.
 
         Returns:
            Iterable: Either List[Tuple[str, float]] or List[str]
@@ -146,39 +317,233 @@ class Rake:
         Raises:
             UserWarning
         """
-        if not isinstance(input_text, str):
-            msg = "input_text must be type str; returning empty list"
+        if isinstance(input_text, (bytes, bytearray, memoryview)):
+            if not _NON_BLANK_B.search(input_text):
+                msg = "input_text is empty; returning empty list"
+                warnings.warn(msg, UserWarning)
+                return []
+        elif not isinstance(input_text, str):
+            msg = "input_text must be type str or bytes; returning empty list"
             warnings.warn(msg, UserWarning)
             return []
-
-        if not input_text.strip():
+        elif not input_text.strip():
             msg = "input_text is empty; returning empty list"
             warnings.warn(msg, UserWarning)
             return []
 
-        # algorithm begins
-        sentence_list = alg.split_sentences(
-            input_text, self._sentence_splitter
+        if self.backend is not None:
+            return self.backend.extract(self, input_text)
+        return self._extract(input_text)
+
+    def _extract(self, input_text: str) -> Iterable:
+        # offsets are found by scanning all the candidates, in text order
+        candidates = self._candidates(input_text)
+        ranked = self._rank_phrases(self._ngram_filter(candidates))
+        return self._result(input_text, ranked, candidates)
+
+    def _result(self, input_text, ranked: list, phrases=None) -> Iterable:
+        if not self.compact or not ranked:
+            return ranked
+        return KeywordList.from_ranked(
+            input_text, ranked, self.kw_only, phrases
         )
-        phrase_list = alg.gen_cand_keywords(sentence_list, self._stop_words_re)
+
+    def _warn_no_keywords(self) -> None:
         if self.ngram_range is not None:
-            phrase_list = [
-                p
-                for p in phrase_list
-                if self.ngram_range[0] <= len(p.split()) <= self.ngram_range[1]
-            ]
-        if not phrase_list:
-            msg = "No keywords for ngram_range " + str(self.ngram_range) + ". "
-            msg += "Returning empty list."
+            msg = "No keywords for ngram_range " + str(self.ngram_range)
+            msg += ". Returning empty list."
             warnings.warn(msg, UserWarning)
+
+    def _rank_phrases(self, phrase_list: list) -> list:
+        if not phrase_list:
+            self._warn_no_keywords()
             return []
+        keyword_candidates = self._scores(phrase_list)
+        return self._ranked(keyword_candidates)
 
-        word_scores, phrase_words = alg.calc_word_scores(
-            phrase_list, self._word_splitter
-        )
+    def extract_sentences(self, sentences: Iterable) -> Iterable:
+        """
+        Extract and rank the keywords from a document that has already been
+        split into sentences or tokens, skipping the tokenization done by
+        `__call__`.
+
+        Each sentence is either a `str`, which is still split on punctuation
+        and stopwords, or a sequence of tokens. Tokens are `str` or objects
+        having a `text` attribute (e.g., a spaCy `Token`); a token is a
+        phrase boundary if it is a stopword or contains a sentence delimiter,
+        and whitespace tokens are ignored. An object with a `sents` attribute
+        (e.g., a spaCy `Doc`) is accepted in place of the sentences.
+
+        Args:
+            sentences (Iterable): sentences or token sequences
+
+        Returns:
+           Iterable: Either List[Tuple[str, float]] or List[str]
+
+        Raises:
+            UserWarning
+        """
+        if hasattr(sentences, "sents"):
+            sentences = sentences.sents
+        phrase_list = list()
+        for sentence in sentences:
+            if isinstance(sentence, str):
+                for part in alg.split_sentences(
+                    sentence, self._sentence_splitter
+                ):
+                    phrase_list.extend(
+                        stops.split_on_stopwords(
+                            part, self._stop_words_re, self._overlay
+                        )
+                    )
+            else:
+                phrase_list.extend(self._token_phrases(sentence))
+
+        return self._rank_phrases(self._ngram_filter(phrase_list))
+
+    def extract_sections(
+        self, sections, weights: Mapping[str, float] = None
+    ) -> Tuple[Iterable, dict]:
+        """
+        Extract and rank the keywords of each labelled section of a document
+        and of the document as a whole, in one pass. The word counts of each
+        section are computed once and the document scores are computed from
+        their sum, so with the default weights the document ranking is that
+        of `__call__` on the sections joined by sentence breaks. A weight
+        multiplies the document score of each phrase found in that section;
+        a phrase found in several sections gets the largest of their
+        weights.
+
+        Args:
+            sections (Mapping|Iterable): section label -> text, or
+                (label, text) pairs in document order
+
+            weights (Mapping|None): section label -> weight > 0 for the
+                document scores; missing labels get 1.0; Default: None
+
+        Returns:
+            tuple(list, dict): the document keywords, a list even if
+                `compact`, and section label -> keywords. Empty or non-str
+                sections have no keywords.
+
+        Raises:
+            ValueError if a weight is not positive
+        """
+        items = sections.items() if isinstance(sections, Mapping) else sections
+        weights = weights or dict()
+        by_section = dict()
+        phrase_words = dict()
+        phrase_weights = dict()
+        counts = list()
+        for label, text in items:
+            weight = weights.get(label, 1.0)
+            if not weight > 0:
+                raise ValueError(f"weight must be > 0, got {label}: {weight}")
+            if not isinstance(text, str) or not text.strip():
+                by_section[label] = []
+                continue
+            candidates = self._candidates(text)
+            section_words = alg.phrase_word_lists(
+                self._ngram_filter(candidates), self._word_splitter
+            )
+            freq, degree = alg.count_words(section_words)
+            counts.append((freq, degree))
+            for phrase, word_list in section_words:
+                phrase_words.setdefault(phrase, word_list)
+                if weight > phrase_weights.get(phrase, 0.0):
+                    phrase_weights[phrase] = weight
+            ranked = []
+            if section_words:
+                ranked = self._ranked(
+                    alg.calc_cand_keyword_scores(
+                        section_words, alg.word_scores(freq, degree)
+                    )
+                )
+            by_section[label] = self._result(text, ranked, candidates)
+
+        if not phrase_words:
+            return [], by_section
+        freq, degree = alg.merge_counts(counts)
         keyword_candidates = alg.calc_cand_keyword_scores(
-            phrase_words, word_scores
+            phrase_words.items(), alg.word_scores(freq, degree)
+        )
+        if weights:
+            keyword_candidates = {
+                phrase: score * phrase_weights[phrase]
+                for phrase, score in keyword_candidates.items()
+            }
+        return self._ranked(keyword_candidates), by_section
+
+    def _token_phrases(self, tokens: Iterable) -> list:
+        is_stop = self._stop_words_re.fullmatch
+        is_delim = self._sentence_splitter.search
+        is_custom = self._overlay.fullmatch if self._overlay else None
+        phrases = list()
+        run = list()
+        for token in tokens:
+            token = token if isinstance(token, str) else token.text
+            if not token.strip():
+                continue
+            # a lone "-" token stands for the " - " delimiter of raw text
+            if (
+                is_stop(token)
+                or is_delim(token)
+                or not token.strip("-")
+                or (is_custom and is_custom(token))
+            ):
+                if run:
+                    phrases.append(" ".join(run))
+                    run = list()
+            else:
+                run.append(token)
+        if run:
+            phrases.append(" ".join(run))
+        return phrases
+
+    def _phrases(self, input_text: str) -> list:
+        return self._ngram_filter(self._candidates(input_text))
+
+    def _candidates(self, input_text: str) -> list:
+        if isinstance(input_text, str):
+            sentence_re = self._sentence_splitter
+            stop_re = self._stop_words_re
+            overlay = self._overlay
+        else:
+            sentence_re = self._sentence_splitter_b
+            stop_re = self._stop_words_re_b
+            overlay = self._overlay_b
+        sentence_list = alg.split_sentences(input_text, sentence_re)
+        return list(
+            alg.gen_cand_keywords(
+                sentence_list, stop_re, self.sentence_cache, overlay
+            )
         )
+
+    def _ngram_filter(self, phrase_list: list) -> list:
+        if self.ngram_range is None:
+            return phrase_list
+        return [
+            p
+            for p in phrase_list
+            if self.ngram_range[0] <= len(p.split()) <= self.ngram_range[1]
+        ]
+
+    def _scores(self, phrase_list: list) -> dict:
+        splitter = self._word_splitter
+        if not isinstance(phrase_list[0], str):
+            splitter = self._word_splitter_b
+        word_scores, phrase_words = alg.calc_word_scores(
+            phrase_list, splitter
+        )
+        return alg.calc_cand_keyword_scores(phrase_words, word_scores)
+
+    def _ranked(self, keyword_candidates: dict) -> list:
+        if self.idf_index is not None:
+            keyword_candidates = self.idf_index.reweight(
+                keyword_candidates, self.idf_weight
+            )
+        if self.merge_variants:
+            keyword_candidates = norm.merge_variants(keyword_candidates)
         sorted_keywords = sorted(
             keyword_candidates.items(),
             key=operator.itemgetter(1),
@@ -221,3 +586,94 @@ class Rake:
                 raise ValueError(
                     f"invalid ngram_range, got {self.ngram_range}"
                 )
+
+
+class MultiRake:
+    """
+    Apply several output configurations to a document in one pass. The
+    sentences, candidate phrases, and their words are computed once; word
+    scores are computed once per distinct `ngram_range`. Each configuration
+    is given as a `Rake` and the results are identical to calling each one
+    separately.
+
+    Args:
+        specs (list(Rake)): configurations sharing the same `stopword_name`
+            `custom_stopwords`, and `stopword_overlay`
+
+    Raises:
+        ValueError if `specs` is empty or the stopwords differ
+
+    Examples:
+        >>> from fast_rake import MultiRake, Rake
+        >>>
+        >>> multi = MultiRake(
+        ...     [
+        ...         Rake(),
+        ...         Rake(ngram_range=(1, 2), max_kw=10),
+        ...         Rake(kw_only=True),
+        ...     ]
+        ... )
+        >>> full, short, tags = multi("My lifeboat is full of eels.")
+    """
+
+    def __init__(self, specs: List[Rake]) -> None:
+        if not specs:
+            raise ValueError("at least one spec is required")
+        self.specs = list(specs)
+        self._base = self.specs[0]
+        for spec in self.specs[1:]:
+            if spec._stop_key != self._base._stop_key:
+                raise ValueError(
+                    "all specs must share `stopword_name`, "
+                    "`custom_stopwords`, and `stopword_overlay`"
+                )
+
+    def __call__(self, input_text: str) -> List[Iterable]:
+        """
+        Extract and rank the keywords from `input_text` for each spec.
+
+        Args:
+            input_text (str): Text from which keywords will be extracted and
+                ranked.
+
+        Returns:
+           List[Iterable]: one result per spec, in order
+
+        Raises:
+            UserWarning
+        """
+        if not isinstance(input_text, str) or not input_text.strip():
+            msg = "input_text must be a non-empty str; returning empty lists"
+            warnings.warn(msg, UserWarning)
+            return [[] for _ in self.specs]
+
+        base = self._base
+        candidates = base._candidates(input_text)
+        phrase_words = alg.phrase_word_lists(candidates, base._word_splitter)
+        by_ngram = dict()
+        results = list()
+        for spec in self.specs:
+            if spec.ngram_range not in by_ngram:
+                by_ngram[spec.ngram_range] = self._scores(spec, phrase_words)
+            keyword_candidates = by_ngram[spec.ngram_range]
+            if keyword_candidates is None:
+                results.append([])
+            else:
+                ranked = spec._ranked(keyword_candidates)
+                results.append(spec._result(input_text, ranked, candidates))
+        return results
+
+    @staticmethod
+    def _scores(spec: Rake, phrase_words: list):
+        if spec.ngram_range is not None:
+            lo, hi = spec.ngram_range
+            phrase_words = [
+                (p, wl) for p, wl in phrase_words if lo <= len(p.split()) <= hi
+            ]
+        if not phrase_words:
+            spec._warn_no_keywords()
+            return None
+        freq, degree = alg.count_words(phrase_words)
+        return alg.calc_cand_keyword_scores(
+            phrase_words, alg.word_scores(freq, degree)
+        )
@@ -0,0 +1,260 @@
+# MIT License
+# Copyright (c) 2017 - 2022, Chris Skiscim
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+Automatic choice between the serial and the parallel extraction paths.
+
+Each path is described by a `CostModel` measured on this machine. Parallel
+paths pay for starting a process pool, so serial extraction wins up to some
+document length or batch size and the parallel path wins beyond it. The
+models are calibrated on first use and saved to a profile file, so later
+processes skip the calibration. The profile is
+`$FAST_RAKE_PROFILE` if set, otherwise `fast_rake/profile.json` under the
+user cache directory.
+"""
+import copy
+import json
+import logging
+import os
+import threading
+import time
+from collections import Counter
+from typing import List, Optional, Sequence
+
+import fast_rake.parallel as par
+import fast_rake.schedule as sch
+import fast_rake.version as v
+from fast_rake.schedule import CostModel
+
+logger = logging.getLogger(__name__)
+
+# document sizes timed for the parallel path
+_DOC_SIZES = (1 << 18, 1 << 20)
+
+
+def profile_path() -> str:
+    path = os.environ.get("FAST_RAKE_PROFILE")
+    if path:
+        return path
+    cache_dir = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(cache_dir, "fast_rake", "profile.json")
+
+
+def _best_time(fn, doc, repeats: int) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn(doc)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _crossover(serial: CostModel, parallel: CostModel) -> Optional[int]:
+    # the smallest size at which the parallel path is estimated to win
+    if parallel.per_char >= serial.per_char:
+        return None
+    size = (parallel.intercept - serial.intercept) / (
+        serial.per_char - parallel.per_char
+    )
+    return max(1, int(size) + 1)
+
+
+class AutoBackend:
+    """
+    Routes documents to the fastest extraction path; used by
+    `Rake(backend="auto")`.
+
+    Args:
+        max_workers (int|None): processes used by the parallel paths;
+            Default: None, i.e., the number of CPUs
+    """
+
+    def __init__(self, max_workers: int = None) -> None:
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.serial = None
+        self.document = None
+        self.threshold = None
+        self.decisions = Counter()
+        self._in_worker = False
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> dict:
+        # a copy, e.g., in a worker process, always runs serially
+        return {"max_workers": self.max_workers}
+
+    def __setstate__(self, state: dict) -> None:
+        self.__init__(state["max_workers"])
+        self._in_worker = True
+
+    def _profile_key(self, rake) -> str:
+        return "{}/{}/{}".format(
+            rake.stop_words, int(bool(rake.custom_stopwords)), self.max_workers
+        )
+
+    def _load(self, rake) -> bool:
+        try:
+            with open(profile_path(), encoding="utf-8") as fp:
+                profiles = json.load(fp)
+        except (OSError, ValueError):
+            return False
+        if profiles.get("version") != v.__version__:
+            return False
+        entry = profiles.get("profiles", dict()).get(self._profile_key(rake))
+        if entry is None:
+            return False
+        self._set_models(
+            CostModel.from_dict(entry["serial"]),
+            entry["document"] and CostModel.from_dict(entry["document"]),
+        )
+        logger.info(f"loaded backend profile from {profile_path()}")
+        return True
+
+    def _save(self, rake) -> None:
+        path = profile_path()
+        try:
+            with open(path, encoding="utf-8") as fp:
+                profiles = json.load(fp)
+            if profiles.get("version") != v.__version__:
+                raise ValueError
+        except (OSError, ValueError):
+            profiles = {"version": v.__version__, "profiles": dict()}
+        profiles["profiles"][self._profile_key(rake)] = {
+            "serial": self.serial.to_dict(),
+            "document": self.document and self.document.to_dict(),
+        }
+        try:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as fp:
+                json.dump(profiles, fp, indent=2)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"cannot save backend profile: {e}")
+
+    def _set_models(self, serial: CostModel, document: Optional[CostModel]):
+        self.serial = serial
+        self.document = document
+        self.threshold = None
+        if document is not None and self.max_workers > 1:
+            self.threshold = _crossover(serial, document)
+        logger.info(
+            f"serial {serial}; document-parallel {document}; "
+            f"threshold {self.threshold} chars"
+        )
+
+    def calibrate(self, rake, repeats: int = 2) -> "AutoBackend":
+        """
+        Time the serial and the document-parallel paths and save the models
+        to the profile.
+        """
+        plain = copy.copy(rake)
+        plain.backend = None
+        plain.sentence_cache = None
+        serial = CostModel.calibrate(plain, repeats=repeats)
+        document = None
+        if self.max_workers > 1:
+            secs = [
+                _best_time(
+                    lambda doc: par.extract_document(
+                        plain, doc, self.max_workers, self._chunk(len(doc))
+                    ),
+                    sch._synthetic(size),
+                    repeats=1,
+                )
+                for size in _DOC_SIZES
+            ]
+            document = CostModel.fit(_DOC_SIZES, secs)
+        self._set_models(serial, document)
+        self._save(rake)
+        return self
+
+    def _ensure(self, rake) -> None:
+        if self.serial is not None:
+            return
+        with self._lock:
+            if self.serial is None and not self._load(rake):
+                self.calibrate(rake)
+
+    def _chunk(self, n_chars: int) -> int:
+        return max(1, n_chars // self.max_workers)
+
+    def extract(self, rake, text) -> List:
+        """
+        Extract keywords from one document with the path estimated to be
+        fastest for its length.
+        """
+        if self._in_worker or not isinstance(text, str):
+            return rake._extract(text)
+        self._ensure(rake)
+        if self.threshold is not None and len(text) >= self.threshold:
+            self.decisions["document"] += 1
+            logger.debug(f"{len(text):,} chars : document-parallel")
+            return par.extract_document(
+                rake, text, self.max_workers, self._chunk(len(text))
+            )
+        self.decisions["serial"] += 1
+        return rake._extract(text)
+
+    def _map(self, rake, docs: Sequence) -> List:
+        self._ensure(rake)
+        lengths = [len(doc) if isinstance(doc, str) else 0 for doc in docs]
+        serial = sum(self.serial.cost(n) for n in lengths)
+        if self.document is not None and not self._in_worker:
+            parallel = self.document.intercept + serial / self.max_workers
+            if parallel < serial:
+                self.decisions["batch-processes"] += 1
+                logger.debug(f"{len(docs):,} docs : processes")
+                results, _ = sch.map_scheduled(
+                    rake, docs, self.max_workers, cost_model=self.serial
+                )
+                return results
+        self.decisions["batch-serial"] += 1
+        return [rake(doc) for doc in docs]
+
+    def info(self) -> dict:
+        return {
+            "serial": self.serial and self.serial.to_dict(),
+            "document": self.document and self.document.to_dict(),
+            "threshold": self.threshold,
+            "max_workers": self.max_workers,
+            "decisions": dict(self.decisions),
+        }
+
+
+def map_auto(rake, docs: Sequence) -> List:
+    """
+    Extract keywords from each of `docs`, serially or with
+    `schedule.map_scheduled`, whichever is estimated to be faster. A `rake`
+    without `backend="auto"` runs serially.
+
+    Args:
+        rake (Rake): the extractor
+
+        docs (Sequence[str]): documents
+
+    Returns:
+        list: one result per document, in order
+    """
+    if rake.backend is None:
+        return [rake(doc) for doc in docs]
+    return rake.backend._map(rake, docs)
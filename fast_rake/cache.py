@@ -0,0 +1,98 @@
+# MIT License
+# Copyright (c) 2017 - 2022, Chris Skiscim
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+Bounded LRU cache of candidate phrases by sentence.
+
+Crawled text repeats the same sentences (cookie banners, footers, bylines)
+across documents. With a cache, a repeated sentence skips the stopword regex.
+A cache belongs to one `Rake`, since the candidates depend on its stopwords,
+and lives as long as the instance, i.e., across documents in a worker.
+"""
+import threading
+from collections import OrderedDict
+from typing import Pattern
+
+import fast_rake.optimized_stop_list as stops
+
+
+class SentenceCache:
+    """
+    Args:
+        maxsize (int): most sentences kept
+
+    Raises:
+        ValueError if `maxsize` < 1
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        if maxsize < 1:
+            raise ValueError(f"maxsize must be > 0, got {maxsize}")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __getstate__(self) -> dict:
+        # a copy, e.g., in a worker process, starts empty
+        return {"maxsize": self.maxsize}
+
+    def __setstate__(self, state: dict) -> None:
+        self.__init__(state["maxsize"])
+
+    def candidates(
+        self, sentence: str, stopword_re: Pattern, overlay: Pattern = None
+    ) -> tuple:
+        with self._lock:
+            phrases = self._data.get(sentence)
+            if phrases is not None:
+                self._data.move_to_end(sentence)
+                self.hits += 1
+                return phrases
+            self.misses += 1
+        phrases = tuple(
+            stops.split_on_stopwords(sentence, stopword_re, overlay)
+        )
+        with self._lock:
+            self._data[sentence] = phrases
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return phrases
+
+    def info(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
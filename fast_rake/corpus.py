@@ -0,0 +1,205 @@
+# MIT License
+# Copyright (c) 2017 - 2022, Chris Skiscim
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+Checkpointed, resumable extraction over a corpus.
+
+Documents are taken in numbered chunks of `chunk_size` by position, so the
+chunk boundaries do not depend on when a run was interrupted. Each chunk is
+written to `chunk-NNNNNN.jsonl` under a temporary name and moved into place,
+then recorded in `manifest.json` the same way. A rerun on the same output
+directory skips the chunks listed in the manifest.
+"""
+import json
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator, Tuple
+
+import fast_rake.parallel as par
+from fast_rake.result import as_list
+
+logger = logging.getLogger(__name__)
+
+MANIFEST = "manifest.json"
+
+
+def chunk_name(chunk_idx: int) -> str:
+    return f"chunk-{chunk_idx:06d}.jsonl"
+
+
+def _write_atomic(path: str, lines: Iterable[str]) -> None:
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as fp:
+        for line in lines:
+            fp.write(line)
+        fp.flush()
+        os.fsync(fp.fileno())
+    os.replace(tmp_path, path)
+
+
+def _rake_config(rake) -> dict:
+    config = {
+        "stopword_name": rake.stop_words,
+        "custom_stopwords": rake.custom_stopwords,
+        "stopword_overlay": rake.stopword_overlay,
+        "max_kw": rake.max_kw,
+        "ngram_range": rake.ngram_range,
+        "top_percent": rake.top_percent,
+        "kw_only": rake.kw_only,
+        "merge_variants": rake.merge_variants,
+        "idf_index": None,
+        "idf_weight": rake.idf_weight,
+    }
+    index = rake.idf_index
+    if index is not None:
+        # the path alone would miss an index rebuilt in place
+        config["idf_index"] = {
+            "path": os.path.abspath(index.path),
+            "n_docs": index.n_docs,
+            "n_terms": len(index),
+        }
+    # as it reads back from the manifest, e.g., tuples become lists
+    return json.loads(json.dumps(config))
+
+
+def load_manifest(out_dir: str) -> dict:
+    path = os.path.join(out_dir, MANIFEST)
+    if not os.path.isfile(path):
+        return dict()
+    with open(path, encoding="utf-8") as fp:
+        return json.load(fp)
+
+
+def run_corpus(
+    docs: Iterable[Tuple[str, str]],
+    out_dir: str,
+    rake=None,
+    chunk_size: int = 10000,
+    max_workers: int = None,
+) -> dict:
+    """
+    Extract keywords for every document in `docs`, writing the results
+    chunk by chunk to `out_dir`. If `out_dir` holds an earlier run with the
+    same settings, its completed chunks are skipped.
+
+    Args:
+        docs (Iterable[tuple(str, str)]): (document id, text) pairs, e.g.,
+            `examples.data_readers.gen_bbc_title_text()`
+
+        out_dir (str): output directory, created if needed
+
+        rake (Rake|None): the extractor; Default: Rake()
+
+        chunk_size (int): documents per chunk; Default: 10000
+
+        max_workers (int|None): if > 1, the number of worker processes;
+            Default: None, i.e., run in this process
+
+    Returns:
+        dict: the final manifest
+
+    Raises:
+        ValueError if `out_dir` holds a run with different settings
+    """
+    if rake is None:
+        from fast_rake import Rake
+
+        rake = Rake()
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size must be > 0, got {chunk_size}")
+    os.makedirs(out_dir, exist_ok=True)
+
+    config = _rake_config(rake)
+    manifest = load_manifest(out_dir)
+    if manifest:
+        if (
+            manifest["chunk_size"] != chunk_size
+            or manifest["config"] != config
+        ):
+            msg = f"{out_dir} holds a run with different settings"
+            raise ValueError(msg)
+        logger.info(
+            "resuming; {:,} chunks done".format(len(manifest["completed"]))
+        )
+    else:
+        manifest = {
+            "chunk_size": chunk_size,
+            "config": config,
+            "completed": dict(),
+            "finished": False,
+        }
+
+    executor = None
+    if max_workers is not None and max_workers > 1:
+        executor = ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=par._init_worker,
+            initargs=(rake,),
+        )
+    try:
+        for chunk_idx, chunk in enumerate(par.chunked(docs, chunk_size)):
+            if str(chunk_idx) in manifest["completed"]:
+                continue
+            texts = [text for _, text in chunk]
+            if executor is None:
+                results = [rake(text) for text in texts]
+            else:
+                results = list(
+                    executor.map(par._worker_extract, texts, chunksize=64)
+                )
+            name = chunk_name(chunk_idx)
+            _write_atomic(
+                os.path.join(out_dir, name),
+                (
+                    json.dumps({"id": docid, "keywords": as_list(kws)}) + "\n"
+                    for (docid, _), kws in zip(chunk, results)
+                ),
+            )
+            manifest["completed"][str(chunk_idx)] = {
+                "file": name,
+                "docs": len(chunk),
+            }
+            _write_atomic(
+                os.path.join(out_dir, MANIFEST), [json.dumps(manifest)]
+            )
+            logger.info("chunk {:,} : {:,} docs".format(chunk_idx, len(chunk)))
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    manifest["finished"] = True
+    _write_atomic(os.path.join(out_dir, MANIFEST), [json.dumps(manifest)])
+    return manifest
+
+
+def iter_results(out_dir: str) -> Iterator[Tuple[str, list]]:
+    """
+    Yield (document id, keywords) from the completed chunks of a run, in
+    document order.
+    """
+    completed = load_manifest(out_dir).get("completed", dict())
+    for chunk_idx in sorted(completed, key=int):
+        path = os.path.join(out_dir, completed[chunk_idx]["file"])
+        with open(path, encoding="utf-8") as fp:
+            for line in fp:
+                record = json.loads(line)
+                yield record["id"], record["keywords"]
@@ -12,6 +12,7 @@ optional arguments:
   -n NJOBS, --njobs NJOBS
                         number of jobs; the default (-1) uses all available
                         CPUs.
+  -s, --scheduled       use the length-aware scheduler instead of joblib
 """
 # MIT License
 # Copyright (c) 2017-2022, Chris Skiscim
@@ -43,6 +44,7 @@ from joblib import Parallel, delayed
 
 import fast_rake.examples.data_readers as reader
 from fast_rake import Rake
+from fast_rake.schedule import map_scheduled
 
 logger = logging.getLogger(__name__)
 
@@ -53,7 +55,7 @@ def rake_extractor(doc):
     return rake_kw(doc)
 
 
-def run_dataset(dataset, top_dir, njobs):
+def run_dataset(dataset, top_dir, njobs, scheduled=False):
     if dataset == "bbc":
         idx2docid = list()
 
@@ -69,6 +71,19 @@ def run_dataset(dataset, top_dir, njobs):
     else:
         raise ValueError(f"no dataset '{dataset}'")
 
+    if scheduled:
+        max_workers = None if njobs < 1 else njobs
+        doc_kws, report = map_scheduled(
+            rake_kw, list(doc_iterable), max_workers
+        )
+        for pid, stats in sorted(report["workers"].items()):
+            print(
+                "worker {}: {:,} docs  utilization {:0.1%}".format(
+                    pid, stats["docs"], stats["utilization"]
+                )
+            )
+        return idx2docid, doc_kws
+
     doc_kws = Parallel(n_jobs=njobs, prefer="processes", verbose=9)(
         delayed(rake_extractor)(doc) for doc in doc_iterable
     )
@@ -106,13 +121,22 @@ if __name__ == "__main__":
         type=int,
         help="number of jobs; the default (-1) uses all available CPUs.",
     )
+    parser.add_argument(
+        "-s",
+        "--scheduled",
+        dest="scheduled",
+        action="store_true",
+        help="use the length-aware scheduler instead of joblib",
+    )
     args = parser.parse_args()
     if args.dataset == "bbc" and not os.path.isdir(args.top_dir):
         raise ValueError(f"no directory named {args.top_dir}")
 
     print(f"running dataset: {args.dataset}")
     start = time.time()
-    _, kws = run_dataset(args.dataset, args.top_dir, args.njobs)
+    _, kws = run_dataset(
+        args.dataset, args.top_dir, args.njobs, args.scheduled
+    )
     elapsed = time.time() - start
     print(
         "\nnum docs: {:,}  time: {:0.5f} secs  rate {:0.2f} docs/sec".format(
@@ -46,6 +46,16 @@ def gen_bbc_title_text(top_dir, pat="*.txt"):
         yield docid, text
 
 
+def gen_bbc_sections(top_dir, pat="*.txt"):
+    """
+    Yield the document ID and the ("title", ...), ("body", ...) sections of
+    each BBC news article, for `Rake.extract_sections`.
+    """
+    for docid, text in gen_bbc_title_text(top_dir, pat=pat):
+        title = docid.split("-", 2)[-1]
+        yield docid, [("title", title), ("body", text)]
+
+
 def read_bbc_news(top_dir):
     """
     Read the BBC news corpus at `file_path`. The document ID is title
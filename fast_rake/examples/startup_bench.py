@@ -0,0 +1,98 @@
+"""
+usage: startup_bench.py [-h] [-s {google,nltk,sklearn,smart}] [-n NRUNS]
+
+Import-time and first-call benchmark
+
+optional arguments:
+  -h, --help            show this help message and exit
+  -s {google,nltk,sklearn,smart}, --stopword-name {google,nltk,sklearn,smart}
+                        stopword list to use
+  -n NRUNS, --nruns NRUNS
+                        number of fresh interpreters to average over
+"""
+# MIT License
+# Copyright (c) 2017-2022, Chris Skiscim
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+import json
+import subprocess
+import sys
+
+# each stage is timed inside a fresh interpreter, i.e., a cold start
+_SCRIPT = """
+import json, time
+t0 = time.perf_counter()
+from fast_rake import Rake
+t1 = time.perf_counter()
+rake = Rake(stopword_name="{stop}")
+t2 = time.perf_counter()
+rake("My lifeboat is full of eels.")
+t3 = time.perf_counter()
+rake("My hovercraft is full of eels.")
+t4 = time.perf_counter()
+print(json.dumps([t1 - t0, t2 - t1, t3 - t2, t4 - t3]))
+"""
+
+STAGES = ("import", "construct", "first call", "second call")
+
+
+def startup_times(stopword_name, n_runs):
+    totals = [0.0] * len(STAGES)
+    for _ in range(n_runs):
+        out = subprocess.run(
+            [sys.executable, "-c", _SCRIPT.format(stop=stopword_name)],
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+        for idx, t in enumerate(json.loads(out.stdout)):
+            totals[idx] += t
+    return [t / n_runs for t in totals]
+
+
+if __name__ == "__main__":
+    from argparse import ArgumentParser
+
+    allowed = ("google", "nltk", "sklearn", "smart")
+
+    parser = ArgumentParser(
+        description="Import-time and first-call benchmark"
+    )
+    parser.add_argument(
+        "-s",
+        "--stopword-name",
+        dest="stopword_name",
+        choices=allowed,
+        default="smart",
+        help="stopword list to use",
+    )
+    parser.add_argument(
+        "-n",
+        "--nruns",
+        dest="nruns",
+        default=10,
+        type=int,
+        help="number of fresh interpreters to average over",
+    )
+    args = parser.parse_args()
+
+    times = startup_times(args.stopword_name, args.nruns)
+    for stage, t in zip(STAGES, times):
+        print("{:>12s}: {:0.3f} msecs".format(stage, 1000.0 * t))
@@ -0,0 +1,109 @@
+"""
+usage: threads_vs_procs.py [-h] [-d NDOCS] [-w WORKERS [WORKERS ...]]
+
+Compare thread and process pools on this machine
+
+optional arguments:
+  -h, --help            show this help message and exit
+  -d NDOCS, --ndocs NDOCS
+                        number of synthetic documents
+  -w WORKERS [WORKERS ...], --workers WORKERS [WORKERS ...]
+                        pool sizes to try
+"""
+# MIT License
+# Copyright (c) 2017-2022, Chris Skiscim
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+import os
+import random
+import time
+
+from fast_rake import Rake
+from fast_rake.parallel import gil_enabled, map_processes, map_threads
+
+_WORDS = (
+    "the data science of machine learning competitions is hosted on a "
+    "platform for analyzing kernels and source code with an active community "
+    "of scientists who share projects about cloud video classification"
+).split()
+
+
+def synthetic_docs(n_docs, n_sentences=40, seed=13):
+    rng = random.Random(seed)
+    docs = list()
+    for _ in range(n_docs):
+        sents = [
+            " ".join(rng.choices(_WORDS, k=rng.randint(5, 25)))
+            for _ in range(n_sentences)
+        ]
+        docs.append(". ".join(sents) + ".")
+    return docs
+
+
+def bench(docs, workers):
+    rake = Rake(stopword_name="smart").precompile()
+
+    start = time.perf_counter()
+    _ = [rake(doc) for doc in docs]
+    serial = time.perf_counter() - start
+    print("{:>10s} {:>3d}: {:0.3f} secs".format("serial", 1, serial))
+
+    for n in workers:
+        for name, mapper in (
+            ("threads", map_threads),
+            ("processes", map_processes),
+        ):
+            start = time.perf_counter()
+            mapper(rake, docs, max_workers=n)
+            elapsed = time.perf_counter() - start
+            print(
+                "{:>10s} {:>3d}: {:0.3f} secs  speedup {:0.2f}x".format(
+                    name, n, elapsed, serial / elapsed
+                )
+            )
+
+
+if __name__ == "__main__":
+    from argparse import ArgumentParser
+
+    parser = ArgumentParser(
+        description="Compare thread and process pools on this machine"
+    )
+    parser.add_argument(
+        "-d",
+        "--ndocs",
+        dest="ndocs",
+        default=2000,
+        type=int,
+        help="number of synthetic documents",
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        dest="workers",
+        nargs="+",
+        default=[2, os.cpu_count() or 1],
+        type=int,
+        help="pool sizes to try",
+    )
+    args = parser.parse_args()
+
+    print(f"GIL enabled: {gil_enabled()}  CPUs: {os.cpu_count()}")
+    bench(synthetic_docs(args.ndocs), args.workers)
@@ -0,0 +1,195 @@
+# MIT License
+# Copyright (c) 2017 - 2022, Chris Skiscim
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+Document frequency index for IDF-aware scoring.
+
+The index is built offline with the same candidate generation used by `Rake`
+and stored as a sorted table of 64-bit phrase hashes followed by a parallel
+table of IDF values. `IdfIndex` memory-maps the file, so opening it costs
+nothing up front, lookups are a binary search, and worker processes share the
+pages read-only through the OS page cache.
+
+Phrases are case-folded and UTF-8 encoded before hashing, so `bytes` keywords
+from `Rake` find the same entries.
+"""
+import bisect
+import hashlib
+import logging
+import math
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections import Counter
+from typing import Iterable
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"FRAKEIDF"
+_HEADER = struct.Struct("<8sQQ")  # magic, number of documents, number of terms
+
+
+def phrase_hash(phrase: str) -> int:
+    # decode first: `bytes.lower()` would fold ASCII letters only
+    if not isinstance(phrase, str):
+        phrase = bytes(phrase).decode("utf-8", "surrogateescape")
+    key = phrase.lower().encode("utf-8", "surrogateescape")
+    digest = hashlib.blake2b(key, digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+def smooth_idf(doc_freq: int, n_docs: int) -> float:
+    return math.log((1.0 + n_docs) / (1.0 + doc_freq)) + 1.0
+
+
+def build_idf_index(docs: Iterable[str], path: str, rake=None) -> int:
+    """
+    Count the document frequency of every candidate phrase in `docs` and
+    write the index to `path`. The file is written to a temporary name and
+    moved into place, so readers never see a partial index.
+
+    Args:
+        docs (Iterable[str]): the corpus
+
+        path (str): output file
+
+        rake (Rake|None): supplies the candidate generation, i.e., stopwords
+            and `ngram_range`; Default: Rake()
+
+    Returns:
+        int: number of distinct phrases in the index
+    """
+    if rake is None:
+        from fast_rake import Rake
+
+        rake = Rake()
+
+    doc_freq = Counter()
+    n_docs = 0
+    for doc in docs:
+        n_docs += 1
+        if not isinstance(doc, str) or not doc.strip():
+            continue
+        doc_freq.update({phrase_hash(p) for p in rake._phrases(doc)})
+
+    hashes = array("Q", sorted(doc_freq))
+    idfs = array("f", (smooth_idf(doc_freq[h], n_docs) for h in hashes))
+    if sys.byteorder != "little":
+        hashes.byteswap()
+        idfs.byteswap()
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as fp:
+        fp.write(_HEADER.pack(MAGIC, n_docs, len(hashes)))
+        hashes.tofile(fp)
+        idfs.tofile(fp)
+    os.replace(tmp_path, path)
+    logger.info(
+        "idf index : {:,} docs, {:,} phrases".format(n_docs, len(hashes))
+    )
+    return len(hashes)
+
+
+class IdfIndex:
+    """
+    Read-only, memory-mapped view of an index written by `build_idf_index`.
+    Phrases not in the index receive the IDF of a phrase seen in no document.
+
+    Args:
+        path (str): index file
+
+    Raises:
+        ValueError if the file is not an IDF index
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        with open(path, "rb") as fp:
+            self._mm = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.n_docs, n_terms = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            self._mm.close()
+            raise ValueError(f"not an idf index; got {path}")
+
+        h_start = _HEADER.size
+        v_start = h_start + 8 * n_terms
+        if sys.byteorder == "little":
+            buf = memoryview(self._mm)
+            self._hashes = buf[h_start:v_start].cast("Q")
+            self._idfs = buf[v_start : v_start + 4 * n_terms].cast("f")
+        else:
+            self._hashes = array("Q", self._mm[h_start:v_start])
+            self._idfs = array("f", self._mm[v_start : v_start + 4 * n_terms])
+            self._hashes.byteswap()
+            self._idfs.byteswap()
+        self.default_idf = smooth_idf(0, self.n_docs)
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+    def __contains__(self, phrase: str) -> bool:
+        return self._find(phrase_hash(phrase)) is not None
+
+    def __reduce__(self):
+        # reopen, rather than copy, in other processes
+        return self.__class__, (self.path,)
+
+    def __enter__(self) -> "IdfIndex":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _find(self, key: int):
+        idx = bisect.bisect_left(self._hashes, key)
+        if idx < len(self._hashes) and self._hashes[idx] == key:
+            return idx
+        return None
+
+    def idf(self, phrase: str) -> float:
+        idx = self._find(phrase_hash(phrase))
+        return self.default_idf if idx is None else self._idfs[idx]
+
+    def reweight(self, kw_scores: dict, weight: float) -> dict:
+        """
+        Blend keyword scores with phrase IDF,
+        `score * ((1 - weight) + weight * idf)`.
+
+        Args:
+            kw_scores (dict): phrase -> RAKE score
+
+            weight (float): in [0, 1]
+
+        Returns:
+            dict: phrase -> blended score
+        """
+        return {
+            phrase: score * ((1.0 - weight) + weight * self.idf(phrase))
+            for phrase, score in kw_scores.items()
+        }
+
+    def close(self) -> None:
+        if isinstance(self._hashes, memoryview):
+            self._hashes.release()
+            self._idfs.release()
+        self._mm.close()
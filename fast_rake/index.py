@@ -0,0 +1,395 @@
+# MIT License
+# Copyright (c) 2017 - 2022, Chris Skiscim
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+On-disk inverted index from keywords to the documents they were extracted
+from.
+
+An index is a directory of immutable segments listed in `segments.json`.
+Each segment holds a sorted dictionary of case-folded, UTF-8 encoded phrases
+and, per phrase, a postings list of document ids (delta- and varint-encoded)
+followed by the float32 scores. Readers memory-map the segments, so there is
+no load step and lookups touch only the pages they need. `IndexWriter`
+appends a segment per flush; `merge_segments` combines them into one.
+
+Segment layout, little-endian:
+    header            magic, number of terms, terms start, postings start
+    term offsets      uint64[n_terms + 1], into the terms blob
+    postings offsets  uint64[n_terms + 1], into the postings blob
+    terms blob        sorted phrases
+    postings blob     varint count, varint doc id deltas, float32 scores
+"""
+import heapq
+import json
+import logging
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections import defaultdict
+from typing import Iterable, Iterator, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"FRAKEIX1"
+MANIFEST = "segments.json"
+_HEADER = struct.Struct("<8sQQQ")
+
+
+def _term(phrase) -> bytes:
+    # decode first: `bytes.lower()` would fold ASCII letters only
+    if not isinstance(phrase, str):
+        phrase = bytes(phrase).decode("utf-8", "surrogateescape")
+    return phrase.lower().encode("utf-8", "surrogateescape")
+
+
+def _put_varint(n: int, out: bytearray) -> None:
+    while n >= 0x80:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
+
+
+def _get_varint(buf, pos: int) -> Tuple[int, int]:
+    n = shift = 0
+    while True:
+        byte = buf[pos]
+        pos += 1
+        n |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return n, pos
+        shift += 7
+
+
+def _encode_postings(postings: List[Tuple[int, float]]) -> bytes:
+    out = bytearray()
+    _put_varint(len(postings), out)
+    prev = 0
+    for doc_id, _ in postings:
+        _put_varint(doc_id - prev, out)
+        prev = doc_id
+    scores = array("f", (score for _, score in postings))
+    if sys.byteorder != "little":
+        scores.byteswap()
+    out += scores.tobytes()
+    return bytes(out)
+
+
+def _decode_postings(buf, pos: int) -> List[Tuple[int, float]]:
+    count, pos = _get_varint(buf, pos)
+    doc_ids = list()
+    doc_id = 0
+    for _ in range(count):
+        delta, pos = _get_varint(buf, pos)
+        doc_id += delta
+        doc_ids.append(doc_id)
+    scores = struct.unpack_from(f"<{count}f", buf, pos)
+    return list(zip(doc_ids, scores))
+
+
+def _u64_table(buf, start: int, n: int):
+    if sys.byteorder == "little":
+        return memoryview(buf)[start : start + 8 * n].cast("Q")
+    table = array("Q", buf[start : start + 8 * n])
+    table.byteswap()
+    return table
+
+
+def _write_segment(path: str, items: Iterable[Tuple[bytes, list]]) -> int:
+    term_offsets = array("Q", [0])
+    post_offsets = array("Q", [0])
+    terms = bytearray()
+    postings = bytearray()
+    for term, term_postings in items:
+        terms += term
+        postings += _encode_postings(term_postings)
+        term_offsets.append(len(terms))
+        post_offsets.append(len(postings))
+    n_terms = len(term_offsets) - 1
+    terms_start = _HEADER.size + 16 * (n_terms + 1)
+    if sys.byteorder != "little":
+        term_offsets.byteswap()
+        post_offsets.byteswap()
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as fp:
+        fp.write(
+            _HEADER.pack(MAGIC, n_terms, terms_start, terms_start + len(terms))
+        )
+        term_offsets.tofile(fp)
+        post_offsets.tofile(fp)
+        fp.write(terms)
+        fp.write(postings)
+        fp.flush()
+        os.fsync(fp.fileno())
+    os.replace(tmp_path, path)
+    return n_terms
+
+
+class Segment:
+    """Read-only, memory-mapped segment."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        with open(path, "rb") as fp:
+            self._mm = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, n_terms, self._terms_start, self._post_start = (
+            _HEADER.unpack_from(self._mm, 0)
+        )
+        if magic != MAGIC:
+            self._mm.close()
+            raise ValueError(f"not an index segment; got {path}")
+        self.n_terms = n_terms
+        self._term_offsets = _u64_table(self._mm, _HEADER.size, n_terms + 1)
+        self._post_offsets = _u64_table(
+            self._mm, _HEADER.size + 8 * (n_terms + 1), n_terms + 1
+        )
+
+    def __len__(self) -> int:
+        return self.n_terms
+
+    def term(self, idx: int) -> bytes:
+        base = self._terms_start
+        return self._mm[
+            base + self._term_offsets[idx] : base + self._term_offsets[idx + 1]
+        ]
+
+    def postings(self, idx: int) -> List[Tuple[int, float]]:
+        return _decode_postings(
+            self._mm, self._post_start + self._post_offsets[idx]
+        )
+
+    def find(self, term: bytes):
+        lo, hi = 0, self.n_terms
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.term(mid) < term:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self.n_terms and self.term(lo) == term:
+            return lo
+        return None
+
+    def items(self) -> Iterator[Tuple[bytes, list]]:
+        for idx in range(self.n_terms):
+            yield self.term(idx), self.postings(idx)
+
+    def close(self) -> None:
+        for table in (self._term_offsets, self._post_offsets):
+            if isinstance(table, memoryview):
+                table.release()
+        self._mm.close()
+
+
+def _load_manifest(index_dir: str) -> dict:
+    path = os.path.join(index_dir, MANIFEST)
+    if not os.path.isfile(path):
+        return {"segments": list(), "next_segment": 0, "next_doc_id": 0}
+    with open(path, encoding="utf-8") as fp:
+        return json.load(fp)
+
+
+def _save_manifest(index_dir: str, manifest: dict) -> None:
+    path = os.path.join(index_dir, MANIFEST)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as fp:
+        json.dump(manifest, fp)
+        fp.flush()
+        os.fsync(fp.fileno())
+    os.replace(tmp_path, path)
+
+
+def _new_segment(index_dir: str, manifest: dict, items) -> str:
+    name = "seg-{:06d}.fri".format(manifest["next_segment"])
+    manifest["next_segment"] += 1
+    n_terms = _write_segment(os.path.join(index_dir, name), items)
+    logger.debug(f"{name} : {n_terms:,} terms")
+    return name
+
+
+class IndexWriter:
+    """
+    Buffers keyword postings and writes them as a new segment on `flush()`,
+    which also runs on leaving a `with` block. A single writer per index is
+    assumed.
+
+    Args:
+        index_dir (str): index directory, created if needed
+
+        max_buffer_docs (int): flush after this many documents;
+            Default: 100000
+    """
+
+    def __init__(self, index_dir: str, max_buffer_docs: int = 100000) -> None:
+        os.makedirs(index_dir, exist_ok=True)
+        self.index_dir = index_dir
+        self.max_buffer_docs = max_buffer_docs
+        self._manifest = _load_manifest(index_dir)
+        self._buffer = defaultdict(dict)
+        self._n_buffered = 0
+
+    @property
+    def next_doc_id(self) -> int:
+        return self._manifest["next_doc_id"]
+
+    def __enter__(self) -> "IndexWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.flush()
+
+    def add(self, doc_id: int, keywords: Iterable) -> None:
+        """
+        Add the `Rake` output for document `doc_id`, i.e., (keyword, score)
+        pairs or, for `kw_only=True`, keywords, which get a score of 1.0.
+        Case variants of a phrase keep the highest score.
+        """
+        for item in keywords:
+            phrase, score = item if isinstance(item, tuple) else (item, 1.0)
+            term_postings = self._buffer[_term(phrase)]
+            if score > term_postings.get(doc_id, float("-inf")):
+                term_postings[doc_id] = score
+        self._manifest["next_doc_id"] = max(self.next_doc_id, doc_id + 1)
+        self._n_buffered += 1
+        if self._n_buffered >= self.max_buffer_docs:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._n_buffered:
+            return
+        items = (
+            (term, sorted(self._buffer[term].items()))
+            for term in sorted(self._buffer)
+        )
+        name = _new_segment(self.index_dir, self._manifest, items)
+        self._manifest["segments"].append(name)
+        _save_manifest(self.index_dir, self._manifest)
+        self._buffer = defaultdict(dict)
+        self._n_buffered = 0
+
+
+def merge_segments(index_dir: str) -> None:
+    """
+    Replace all segments of an index with a single one. Open readers keep
+    working on the old segments until they are closed.
+    """
+    manifest = _load_manifest(index_dir)
+    old = manifest["segments"]
+    if len(old) < 2:
+        return
+    segments = [Segment(os.path.join(index_dir, name)) for name in old]
+    try:
+        merged = heapq.merge(
+            *(
+                ((term, n, postings) for term, postings in seg.items())
+                for n, seg in enumerate(segments)
+            )
+        )
+
+        def combined():
+            term, postings = None, list()
+            for next_term, _, next_postings in merged:
+                if next_term != term:
+                    if term is not None:
+                        yield term, sorted(dict(postings).items())
+                    term, postings = next_term, list()
+                postings.extend(next_postings)
+            if term is not None:
+                yield term, sorted(dict(postings).items())
+
+        name = _new_segment(index_dir, manifest, combined())
+    finally:
+        for seg in segments:
+            seg.close()
+    manifest["segments"] = [name]
+    _save_manifest(index_dir, manifest)
+    for old_name in old:
+        os.remove(os.path.join(index_dir, old_name))
+    logger.info(f"merged {len(old)} segments into {name}")
+
+
+class IndexReader:
+    """
+    Memory-mapped view of the segments of an index as of opening.
+
+    Args:
+        index_dir (str): index directory
+    """
+
+    def __init__(self, index_dir: str) -> None:
+        manifest = _load_manifest(index_dir)
+        self.segments = [
+            Segment(os.path.join(index_dir, name))
+            for name in manifest["segments"]
+        ]
+
+    def __enter__(self) -> "IndexReader":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __contains__(self, phrase: str) -> bool:
+        term = _term(phrase)
+        return any(seg.find(term) is not None for seg in self.segments)
+
+    def lookup(self, phrase: str) -> List[Tuple[int, float]]:
+        """
+        Documents tagged with `phrase`, matched case-insensitively.
+
+        Returns:
+            list(tuple(int, float)): (document id, score), by document id
+        """
+        term = _term(phrase)
+        postings = list()
+        for seg in self.segments:
+            idx = seg.find(term)
+            if idx is not None:
+                postings.extend(seg.postings(idx))
+        return sorted(postings)
+
+    def close(self) -> None:
+        for seg in self.segments:
+            seg.close()
+
+
+def index_documents(
+    docs: Iterable[str], index_dir: str, rake=None, max_buffer_docs=100000
+) -> range:
+    """
+    Extract keywords from `docs` and add them to the index in `index_dir`,
+    numbering the documents after those already indexed.
+
+    Returns:
+        range: the document ids assigned
+    """
+    if rake is None:
+        from fast_rake import Rake
+
+        rake = Rake()
+    with IndexWriter(index_dir, max_buffer_docs) as writer:
+        first = doc_id = writer.next_doc_id
+        for doc in docs:
+            writer.add(doc_id, rake(doc))
+            doc_id += 1
+    return range(first, doc_id)
@@ -0,0 +1,75 @@
+# MIT License
+# Copyright (c) 2017 - 2022, Chris Skiscim
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+Merging of near-duplicate candidate keywords.
+
+Variants such as "Machine learning models" and "machine learning model" are
+bucketed under one key made of case-folded, lightly stemmed tokens. Bucketing
+is a single pass over the candidates, i.e., linear in their number.
+"""
+from typing import Tuple
+
+# suffixes that look like a plural but are not
+_NOT_PLURAL = ("ss", "us", "is")
+
+
+def light_stem(word: str) -> str:
+    """
+    Case-fold `word` and strip a regular English plural suffix. This is
+    deliberately conservative: it only needs to map inflected variants to
+    the same key, not to produce a linguistic stem.
+    """
+    word = word.lower()
+    if len(word) > 4 and word.endswith("ies"):
+        return word[:-3] + "y"
+    if word.endswith(("sses", "ches", "shes", "xes")):
+        return word[:-2]
+    if len(word) > 3 and word.endswith("s"):
+        if not word.endswith(_NOT_PLURAL):
+            return word[:-1]
+    return word
+
+
+def variant_key(phrase: str) -> Tuple[str, ...]:
+    if isinstance(phrase, bytes):
+        phrase = phrase.decode("utf-8", errors="replace")
+    return tuple(light_stem(w) for w in phrase.split())
+
+
+def merge_variants(kw_scores: dict) -> dict:
+    """
+    Collapse candidates sharing a `variant_key`. The highest scoring variant
+    represents the group and keeps its score.
+
+    Args:
+        kw_scores (dict): phrase -> score
+
+    Returns:
+        dict: representative phrase -> score
+    """
+    best = dict()
+    for phrase, score in kw_scores.items():
+        key = variant_key(phrase)
+        kept = best.get(key)
+        if kept is None or score > kept[1]:
+            best[key] = (phrase, score)
+    return dict(best.values())
@@ -19,26 +19,52 @@
 # LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
 # OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
 # WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+import functools
 import re
 from typing import Pattern
 
 
-def split_on_stopwords(string: str, stops_re: Pattern) -> list:
-    tmp = re.sub(stops_re, "|", string.strip())
-    phrases = tmp.split("|")
+def split_on_stopwords(
+    string: str, stops_re: Pattern, overlay: Pattern = None
+) -> list:
+    bar = "|" if isinstance(string, str) else b"|"
+    tmp = re.sub(stops_re, bar, string.strip())
+    if overlay is not None:
+        tmp = re.sub(overlay, bar, tmp)
+    phrases = tmp.split(bar)
     return [p.strip() for p in phrases if p.strip()]
 
 
-def compile_stops_regex(regex: str, no_trailing: bool) -> Pattern:
+def compile_overlay(customs: list, as_bytes: bool = False) -> Pattern:
+    # custom stopwords on their own, with the boundaries of the full list
+    regex = "(?:" + "|".join([c for c in customs if c.strip()]) + ")"
+    return compile_stops_regex(regex, no_trailing=True, as_bytes=as_bytes)
+
+
+def compile_stops_regex(
+    regex: str, no_trailing: bool, as_bytes: bool = False
+) -> Pattern:
     if no_trailing:
         regex = r"\b" + regex + r"(?![\w-])"
     else:
         regex = r"\b" + regex + r"\b"
+    if as_bytes:
+        return re.compile(regex.encode("utf-8"), re.I)
     return re.compile(regex, re.I)
 
 
 def load_stopwords(
-    stop_name: str, customs: list, no_trailing: bool
+    stop_name: str, customs: list, no_trailing: bool, as_bytes: bool = False
+) -> Pattern:
+    # compiled patterns are cached per process so that every `Rake` using
+    # the same stopword configuration shares one compiled matcher
+    customs = tuple(customs) if customs else None
+    return _load_stopwords(stop_name, customs, no_trailing, as_bytes)
+
+
+@functools.lru_cache(maxsize=32)
+def _load_stopwords(
+    stop_name: str, customs: tuple, no_trailing: bool, as_bytes: bool
 ) -> Pattern:
     if stop_name == "nltk":
         stop_re = nltk_optimized()
@@ -55,7 +81,7 @@ def load_stopwords(
         stop_re = stop_re[:-1]
         customs_re = "|".join([c for c in customs if c.strip()])
         stop_re += "|" + customs_re + ")"
-    return compile_stops_regex(stop_re, no_trailing)
+    return compile_stops_regex(stop_re, no_trailing, as_bytes)
 
 
 def nltk_optimized() -> str:
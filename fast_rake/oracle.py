@@ -0,0 +1,313 @@
+# MIT License
+# Copyright (c) 2017 - 2022, Chris Skiscim
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+usage: python -m fast_rake.oracle [-h] [-n NTEXTS] [--seed SEED]
+                                  [-s {google,nltk,sklearn,smart}]
+
+Differential testing of extraction backends against a frozen reference.
+
+`reference_rake` is a self-contained copy of the original `Rake` +
+`rake_alg` + regex implementation and must not change. Every backend
+registered with `register_backend` has to reproduce its ranking and scores
+exactly on the texts from `adversarial_texts`; `compare` also records the
+backend's speedup over the reference on the same texts.
+"""
+import functools
+import operator
+import random
+import re
+import time
+from collections import defaultdict
+from itertools import chain
+from typing import Callable, Dict, Iterator, List
+
+# -- frozen reference: do not "optimize" anything below this line ------------
+_REF_WORD = re.compile("[^a-zA-Z0-9_\\+\\-/]")
+_REF_SENTENCE = re.compile("[.!?,;:\t\\\\\"\\(\\)\\'’–]|\\s\\-\\s")
+# copies of the stopword patterns as of this reference, so that a change
+# to the live patterns in `optimized_stop_list` shows up as a mismatch
+_REF_STOPS = {
+    "google": "(?:w(?:h(?:e(?:re(?:'s)?|n(?:'s)?)|i(?:ch|le)|o(?:'s|m)?|at(?:'s)?|y(?:'s)?)|e(?:'(?:(?:v|r)e|ll|d)|re(?:n't)?)?|o(?:uld(?:n't)?|n't)|as(?:n't)?|ith)|h(?:e(?:r(?:s(?:elf)|e(?:'s)?)?|'(?:[ds]|ll))?|a(?:v(?:e(?:n't)?|ing)|d(?:n't)?|s(?:n't)?)|i(?:m(?:self)?|s)|ow(?:'s)?)|t(?:h(?:e(?:y(?:'(?:[rv]e|ll|d))?|re(?:'s)?|mselves|irs?|se|n)?|a(?:t(?:'s)?|n)|rough|em|ose|is)|o?o)|o(?:u(?:r(?:(?:selve)?s)?|(?:gh)?t)|(?:(?:th|v)e)?r|n(?:c e|ly)?|f?f|wn)|s(?:h(?:e(?:'(?:[ds]|ll))?|ould(?:n't)?|an't)|o(?:me)?|ame|uch)|i(?:t(?:s(?:elf)?|'s)?|'(?:[dm]|ll|ve)|s(?:n't)?|n(?:to)?|f)?|a(?:[mst]|bo(?:ut|ve)|gain(?:st)?|re(?:n't)?|n[dy]?|fter|ll)|b(?:e(?:(?:caus|for)e|(?:twe)?en|ing|low)?|oth|ut|y)|yo(?:u(?:r(?:sel(?:ves|f))?|'(?:[rv]e|ll|d))?| urs)|d(?:o(?:es(?:n't)?|ing|n't|wn)?|id(?:n't)|uring)|m(?:o(?:re|st)|y(?:self)?|ustn't|e)|c(?:ould(?:n't)?|an(?:no|')t)|f(?:(?:urthe|o)r|rom|ew)|u(?:n(?:der|til)|p)|no[rt]?|let's|each|very)",  # noqa
+    "nltk": "(?:w(?:h(?:i(?:ch|le)|e(?:re|n)|om?|at|y)|o(?:uldn(?:'t)?|n(?:'t)?)|e(?:re(?:n(?:'t)?)?)?|as(?:n(?:'t)?)?|i(?:ll|th))|h(?:a(?:v(?:e(?:n(?:'t)?)?|ing)|d(?:n(?:'t)?)?|s(?:n(?:'t)?)?)|e(?:r(?:s(?:elf)?|e)?)?|i(?:m(?:self)?|s)|ow)|t(?:h(?:e(?:[ny]|m(?:selves)?|[rs]e|irs?)?|a(?:t(?:'ll)?|n)|rough|ose|is)|o?o)?|a(?:[mst]|re(?:n(?:'t)?)?|bo(?:ut|ve)|gain(?:st)?|n[dy]?|fter|in|ll)?|s(?:h(?:ould(?:n(?:'t)?|'ve)?|an(?:'t)?|e(?:'s)?)|o(?:me)?|ame|uch)?|d(?:o(?:es(?:n(?:'t)?)?|n(?:'t)?|ing|wn)?|id(?:n(?:'t)?)?|uring)?|o(?:u(?:r(?:(?:selve)?s)?|t)|(?:(?:th|v)e)?r|n(?:ce|ly)?|f?f|wn)?|m(?:[ae]|ightn(?:'t)?|ustn(?:'t)?|o(?:re|st)|y(?:self)?)?|b(?:e(?:(?:caus|for)e|(?:twe)?en|ing|low)?|oth|ut|y)|y(?:ou(?:r(?:s(?:el(?:ves|f))?)?|'(?:[rv]e|ll|d))?)?|i(?:t(?:s(?:elf)?|'s)?|s(?:n(?:'t)?)?|n(?:to)?|f)?|f(?:(?:urthe|o)r|rom|ew)|n(?:eedn(?:'t)?|o[rtw]?)|c(?:ouldn(?:'t)?|an)|u(?:n(?:der|til)|p)|ve(?:ry)?|each|just|ll|re)",  # noqa
+    "sklearn": "(?:t(?:h(?:e(?:re(?:(?:upo|i)n|after|fore|by)?|m(?:selves)?|n(?:ce)?|ir|se|y)?|r(?:ough(?:out)?|ee|u)|i(?:[ns]|ck|rd)|o(?:ugh|se)|a[nt]|us)|o(?:[op]|gether|wards?)?|w(?:e(?:lve|nty)|o)|ake|en)|a(?:n(?:y(?:w(?:here|ay)|thing|how|one)?|other|d)?|l(?:on[eg]|though|ready|most|ways|so|l)|m(?:o(?:un(?:gs)?t|ng(?:st)?))?|fter(?:wards)?|bo(?:ut|ve)|gain(?:st)?|r(?:ound|e)|(?:cros)?s|t)?|w(?:h(?:e(?:re(?:a(?:fter|s)|(?:upo|i)n|ver|by)?|n(?:ever|ce)?|ther)|o(?:[ls]e|ever|m)?|i(?:ther|ch|le)|at(?:ever)?|y)|i(?:th(?:out|in)?|ll)|e(?:ll|re)?|ould|as)|s(?:o(?:me(?:t(?:imes?|hing)|(?:wher|on)e|how)?)?|e(?:e(?:m(?:ing|ed|s)?)?|rious|veral)|i(?:(?:nc(?:er)?|d)e|x(?:ty)?)|h(?:o(?:uld|w)|e)|ystem|till|ame|uch)|b(?:e(?:c(?:om(?:es?|ing)|a(?:us|m)e)|fore(?:hand)?|(?:hi|yo)nd|(?:twe)?en|sides?|ing|low)?|ot(?:tom|h)|ack|ill|ut|y)|h(?:e(?:r(?:e(?:(?:upo|i)n|after|by)?|s(?:elf)?)?|nce)?|a(?:s(?:nt)?|ve|d)|i(?:m(?:self)?|s)|ow(?:ever)?|undred)|e(?:ve(?:r(?:y(?:(?:wher|on)e|thing)?)?|n)|l(?:s(?:ewher)?e|even)|i(?:ther|ght)|(?:noug|ac)h|xcept|mpty|tc|g)|f(?:i(?:ft(?:een|y)|r(?:st|e)|ll|nd|ve)|o(?:r(?:mer(?:ly)?|ty)?|u(?:nd|r))|u(?:rther|ll)|ro(?:nt|m)|ew)|m(?:o(?:re(?:over)?|st(?:ly)?|ve)|i(?:ght|ll|ne)|(?:eanwhil)?e|a(?:n?y|de)|u(?:ch|st)|y(?:self)?)|n(?:o(?:t(?:hing)?|w(?:here)?|body|o?ne|r)?|e(?:ver(?:theless)?|ither|xt)|ame(?:ly)?|ine)|o(?:u(?:r(?:(?:selve)?s)?|t)|n(?:c?e|ly|to)?|ther(?:wise|s)?|f(?:ten|f)?|(?:ve)?r|wn)|i(?:[efs]|n(?:t(?:erest|o)|deed|c)?|t(?:s(?:elf)?)?)?|c(?:a(?:n(?:(?:no)?t)?|ll)|o(?:uld(?:nt)?|n)?|ry)|d(?:e(?:scribe|tail)?|o(?:ne|wn)?|u(?:ring|e))|l(?:a(?:tter(?:ly)?|st)|e(?:ast|ss)|td)|y(?:ou(?:r(?:s(?:el(?:ves|f))?)?)?|et)|p(?:er(?:haps)?|(?:ar|u)t|lease)|u(?:n(?:der|til)?|p(?:on)?|s)|g(?:ive|et|o)|r(?:ather|e)|v(?:ery|ia)|keep)",  # noqa
+    "smart": "(?:a(?:n(?:y(?:w(?:ays?|here)|thing|body|how|one)?|other|d)?|l(?:l(?:ows?)?|on[eg]|though|ready|most|ways|so)|p(?:p(?:r(?:opr|ec)iate|ear)|art)|c(?:cording(?:ly)?|tually|ross)|s(?:k(?:ing)?|sociated|ide)?|r(?:e(?:n't)?|ound)|b(?:o(?:ut|ve)|le)|m(?:ong(?:st)?)?|fter(?:wards)?|w(?:full|a)y|gain(?:st)?|(?:in')?t|vailable|'s)?|t(?:h(?:e(?:re(?:(?:upo|i)n|after|fore|'?s|by)?|y(?:'(?:[rv]e|ll|d))?|m(?:selves)?|n(?:ce)?|irs?|se)?|a(?:n(?:ks?|x)?|t(?:'?s)?)|o(?:rough(?:ly)?|ugh|se)|r(?:ough(?:out)?|ee|u)|i(?:nk|rd|s)|us)?|r(?:y(?:ing)?|ie[ds]|uly)|o(?:gether|wards?|ok?)?|e(?:nds|ll)|w(?:ice|o)|aken?|'s)?|s(?:e(?:e(?:m(?:ing|ed|s)?|ing|n)?|n(?:sible|t)|rious(?:ly)?|cond(?:ly)?|ve(?:ral|n)|l(?:ves|f))|o(?:me(?:t(?:imes?|hing)|wh(?:ere|at)|body|how|one)?|rry|on)?|a(?:y(?:ing|s)?|id|me|w)|h(?:ould(?:n't)?|all|e)|pecif(?:y(?:ing)?|ied)|u(?:[bp]|ch|re)|i(?:nce|x)|till)?|w(?:h(?:e(?:re(?:a(?:fter|s)|(?:upo|i)n|ver|'s|by)?|n(?:ever|ce)?|ther)|o(?:[ls]e|ever|'s|m)?|i(?:ther|ch|le)|at(?:ever|'s)?|y)|e(?:'(?:[rv]e|ll|d)|l(?:come|l)|re(?:n't)?|nt)?|i(?:th(?:out|in)?|ll(?:ing)?|sh)|o(?:n(?:der|'t)|uld(?:n't)?)|a(?:s(?:n't)?|nts?|y))?|c(?:o(?:n(?:s(?:ider(?:ing)?|equently)|tain(?:ing|s)?|cerning)|u(?:ld(?:n't)?|rse)|rresponding|m(?:es?)?)?|a(?:n(?:(?:no|')?t)?|uses?|me)|(?:urrent|lear)ly|ertain(?:ly)?|'(?:mon|s)|hanges)?|h(?:e(?:r(?:e(?:(?:upo|i)n|after|'s|by)?|s(?:elf)?)?|l(?:lo|p)|nce|'s)?|a(?:v(?:e(?:n't)?|ing)|d(?:n't)?|s(?:n't)?|ppens|rdly)|o(?:w(?:beit|ever)?|pefully)|i(?:m(?:self)?|ther|s)?)?|i(?:n(?:d(?:icate[ds]?|eed)|s(?:ofar|tead)|asmuch|ward|ner|to|c)?|t(?:'(?:[ds]|ll)|s(?:elf)?)?|'(?:[dm]|ll|ve)|(?:mmediat)?e|s(?:n't)?|gnored|f)?|e(?:ve(?:r(?:y(?:(?:wher|on)e|thing|body)?)?|n)|x(?:a(?:ctly|mple)|cept)?|n(?:tirely|ough)|i(?:ther|ght)|ls(?:ewher)?e|specially|ach|tc?|du|g)?|n(?:o(?:r(?:mally)?|t(?:hing)?|w(?:here)?|body|ne?|one|vel)?|e(?:ver(?:theless)?|ar(?:ly)?|cessary|ither|eds?|xt|w)|ame(?:ly)?|ine|d)?|o(?:[hr]|u(?:r(?:(?:selve)?s)?|t(?:side)?|ght)|n(?:es?|ce|ly|to)?|ther(?:wise|s)?|f(?:ten|f)?|ver(?:all)?|bviously|k(?:ay)?|ld|wn)?|b(?:e(?:c(?:om(?:es?|ing)|a(?:us|m)e)|fore(?:hand)?|t(?:ween|ter)|l(?:ieve|ow)|s(?:ides?|t)|(?:hi|yo)nd|ing|en)?|rief|oth|ut|y)?|d(?:o(?:wn(?:wards)?|es(?:n't)?|n(?:'t|e)|ing)?|e(?:s(?:cribed|pite)|finitely)|i(?:d(?:n't)?|fferent)|uring)?|m(?:o(?:re(?:over)?|st(?:ly)?)|a(?:(?:inl|n)y|y(?:be)?)|e(?:an(?:while)?|rely)?|u(?:ch|st)|y(?:self)?|ight)?|l(?:a(?:t(?:ter(?:ly)?|e(?:ly|r))|st)|e(?:t(?:'s)?|s[st]|ast)|i(?:ke(?:ly|d)?|ttle)|ook(?:ing|s)?|td)?|u(?:n(?:l(?:ikely|ess)|fortunately|t(?:il|o)|der)?|s(?:e(?:[ds]|ful)?|ually|ing)?|p(?:on)?|ucp)?|f(?:o(?:r(?:mer(?:ly)?|th)?|llow(?:ing|ed|s)|ur)|i(?:fth|rst|ve)|urther(?:more)?|rom|ar|ew)?|p(?:r(?:o(?:bably|vides)|esumably)|l(?:aced|ease|us)|articular(?:ly)?|er(?:haps)?|ossible)?|r(?:e(?:(?:(?:spec|la)tive|a(?:sonab|l))ly|gard(?:(?:les)?s|ing))?|ather|ight|d)?|g(?:o(?:t(?:ten)?|ing|es|ne)?|et(?:ting|s)?|reetings|ive[ns])?|y(?:ou(?:r(?:s(?:el(?:ves|f))?)?|'(?:[rv]e|ll|d))?|e[st])?|v(?:a(?:rious|lue)|i[az]|ery|s)?|k(?:e(?:eps?|pt)|now[ns]?)?|q(?:u(?:it)?e|v)?|j(?:ust)?|z(?:ero)?|x)",  # noqa
+}
+
+
+def _ref_is_number(s):
+    try:
+        float(s) if "." in s else int(s)
+        return True
+    except ValueError:
+        return False
+
+
+def _ref_split_on_stopwords(string, stops_re):
+    tmp = re.sub(stops_re, "|", string.strip())
+    phrases = tmp.split("|")
+    return [p.strip() for p in phrases if p.strip()]
+
+
+@functools.lru_cache(maxsize=None)
+def _ref_stop_re(stopword_name, customs):
+    regex = _REF_STOPS[stopword_name]
+    if customs:
+        regex = regex[:-1] + "|" + "|".join(c for c in customs if c.strip())
+        regex += ")"
+    return re.compile(r"\b" + regex + r"(?![\w-])", re.I)
+
+
+def reference_rake(
+    text: str, stopword_name: str = "smart", custom_stopwords: tuple = None
+) -> list:
+    """
+    The original algorithm with `top_percent=1.0` and no `ngram_range`.
+
+    Returns:
+        list(tuple(str, float)): all keywords, ranked
+    """
+    if not isinstance(text, str) or not text.strip():
+        return []
+    stop_re = _ref_stop_re(stopword_name, custom_stopwords)
+    sentence_list = _REF_SENTENCE.split(text)
+    phrase_list = chain.from_iterable(
+        [_ref_split_on_stopwords(s, stop_re) for s in sentence_list]
+    )
+    word_frequency = defaultdict(int)
+    word_degree = defaultdict(int)
+    phrase_words = list()
+    for phrase in phrase_list:
+        word_list = [
+            w.strip()
+            for w in _REF_WORD.split(phrase)
+            if w.strip() and not _ref_is_number(w)
+        ]
+        word_list_degree = len(word_list) - 1
+        phrase_words.append((phrase, word_list))
+        for word in word_list:
+            word_frequency[word] += 1
+            word_degree[word] += word_list_degree
+    for wf in word_frequency:
+        word_degree[wf] = word_degree[wf] + word_frequency[wf]
+    word_score = {
+        w: word_degree[w] / word_frequency[w] for w in word_frequency
+    }
+    kw_score = dict()
+    for phrase, word_list in phrase_words:
+        if not word_list:
+            continue
+        kw_score[phrase] = functools.reduce(
+            operator.add, [word_score[word] for word in word_list]
+        )
+    return sorted(kw_score.items(), key=operator.itemgetter(1), reverse=True)
+
+
+# -- end of frozen reference -------------------------------------------------
+
+_WORDS = (
+    "data science machine learning model models Kaggle platform kernels "
+    "co-founder state-of-the-art the of and a is it's don't won't "
+    "café naïve Zürich 東京 データ emoji🙂 résumé "
+    "x y z A B C foo_bar c++ i/o e-mail -dash dash- the- -the"
+).split()
+_NUMBERS = ("1e5", "3.14", "-12", "007", "1.2.3", "2010", "12.75", ".5", "5.")
+_PUNCT = tuple(".,;:!?()'\"\\\t\n’–/+[]") + (
+    "!!!",
+    "...",
+    "|",
+    "||",
+    " - ",
+    "-",
+    "--",
+)
+
+
+def adversarial_texts(n: int = 200, seed: int = 0) -> Iterator[str]:
+    """
+    Yield `n` reproducible texts mixing Unicode words, punctuation runs,
+    `|` characters, number-like tokens, hyphenated stopwords, and, now and
+    then, a very long sentence.
+    """
+    rng = random.Random(seed)
+    for k in range(n):
+        n_tokens = rng.choice((0, 1, 3, 10, 50, 200))
+        if k % 25 == 24:
+            n_tokens = 5000
+        parts = list()
+        for _ in range(n_tokens):
+            pick = rng.random()
+            if pick < 0.65:
+                parts.append(rng.choice(_WORDS))
+            elif pick < 0.75:
+                parts.append(rng.choice(_NUMBERS))
+            else:
+                parts.append(rng.choice(_PUNCT))
+            parts.append(rng.choice((" ", " ", " ", "", "  ", "\n")))
+        yield "".join(parts)
+
+
+_BACKENDS = dict()
+
+
+def register_backend(
+    name: str, factory: Callable, ascii_only: bool = False
+) -> None:
+    """
+    Register a backend to compare against the reference.
+
+    Args:
+        name (str): backend name
+
+        factory (Callable): `factory(stopword_name)` returns a callable that
+            maps a text to a ranked list of (str, float)
+
+        ascii_only (bool): if True, the backend is only compared on ASCII
+            texts; Default: False
+    """
+    _BACKENDS[name] = (factory, ascii_only)
+
+
+def backends() -> List[str]:
+    return list(_BACKENDS)
+
+
+def compare(
+    name: str, texts: List[str], stopword_name: str = "smart"
+) -> Dict:
+    """
+    Run backend `name` and the reference on `texts`.
+
+    Returns:
+        dict: the mismatches, as (text, expected, actual), and the time
+            taken by each implementation
+    """
+    factory, ascii_only = _BACKENDS[name]
+    if ascii_only:
+        texts = [t for t in texts if t.isascii()]
+    extract = factory(stopword_name)
+    if texts:
+        # keep one-time setup, e.g., regex compilation, out of the timings
+        extract(texts[0])
+        reference_rake(texts[0], stopword_name)
+
+    start = time.perf_counter()
+    expected = [reference_rake(t, stopword_name) for t in texts]
+    ref_secs = time.perf_counter() - start
+    start = time.perf_counter()
+    actual = [extract(t) for t in texts]
+    backend_secs = time.perf_counter() - start
+
+    mismatches = [
+        (t, e, a) for t, e, a in zip(texts, expected, actual) if e != a
+    ]
+    return {
+        "backend": name,
+        "texts": len(texts),
+        "mismatches": mismatches,
+        "reference_secs": ref_secs,
+        "backend_secs": backend_secs,
+        "speedup": ref_secs / backend_secs if backend_secs else float("inf"),
+    }
+
+
+def _rake_backend(**kwargs) -> Callable:
+    def factory(stopword_name):
+        from fast_rake import Rake
+
+        return Rake(stopword_name=stopword_name, **kwargs)
+
+    return factory
+
+
+def _bytes_backend(stopword_name):
+    from fast_rake import Rake
+
+    rake = Rake(stopword_name=stopword_name)
+
+    def extract(text):
+        return [(kw.decode("utf-8"), s) for kw, s in rake(text.encode())]
+
+    return extract
+
+
+def _multi_backend(stopword_name):
+    from fast_rake import MultiRake, Rake
+
+    multi = MultiRake(
+        [Rake(stopword_name=stopword_name, kw_only=True, max_kw=3)] * 2
+        + [Rake(stopword_name=stopword_name)]
+    )
+    return lambda text: multi(text)[-1]
+
+
+def _document_backend(stopword_name):
+    from fast_rake import Rake
+    from fast_rake.parallel import extract_document
+
+    rake = Rake(stopword_name=stopword_name)
+    return lambda text: extract_document(rake, text, 2, min_chunk_chars=512)
+
+
+register_backend("rake", _rake_backend())
+register_backend("sentence-cache", _rake_backend(sentence_cache=256))
+register_backend("bytes", _bytes_backend, ascii_only=True)
+register_backend("multi", _multi_backend)
+register_backend("document-parallel", _document_backend)
+register_backend("compact", _rake_backend(compact=True))
+
+
+if __name__ == "__main__":
+    from argparse import ArgumentParser
+
+    allowed = ("google", "nltk", "sklearn", "smart")
+
+    parser = ArgumentParser(description="Differential backend testing")
+    parser.add_argument(
+        "-n",
+        "--ntexts",
+        dest="ntexts",
+        default=200,
+        type=int,
+        help="number of generated texts",
+    )
+    parser.add_argument("--seed", dest="seed", default=0, type=int)
+    parser.add_argument(
+        "-s",
+        "--stopword-name",
+        dest="stopword_name",
+        choices=allowed,
+        default="smart",
+    )
+    args = parser.parse_args()
+
+    generated = list(adversarial_texts(args.ntexts, args.seed))
+    for backend in backends():
+        report = compare(backend, generated, args.stopword_name)
+        print(
+            "{:>18s}: {:>4d} texts  {:>3d} mismatches  "
+            "speedup {:0.2f}x".format(
+                backend,
+                report["texts"],
+                len(report["mismatches"]),
+                report["speedup"],
+            )
+        )
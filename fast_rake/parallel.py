@@ -0,0 +1,268 @@
+# MIT License
+# Copyright (c) 2017 - 2022, Chris Skiscim
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+Batch extraction over thread and process pools.
+
+A `Rake` instance keeps no per-call state, so one instance can be shared by
+any number of threads. On a standard (GIL) build of CPython the threads take
+turns, since neither `re` nor the scoring loops release the GIL; on a
+free-threaded build (3.13t and later) `map_threads` scales with the number of
+cores without the pickling overhead of `map_processes`.
+
+`extract_document` parallelizes a single, very large document by sentence
+chunks and gives the same result as the serial path.
+"""
+import logging
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import chain, islice
+from multiprocessing.shared_memory import SharedMemory
+from typing import Iterable, Iterator, List, Optional, Pattern
+
+import fast_rake.rake_alg as alg
+
+logger = logging.getLogger(__name__)
+
+# one Rake per worker process, installed by the pool initializer
+_worker_rake = None
+
+# longest match of the sentence delimiter regex, i.e., "\s-\s"
+_MAX_DELIM_LEN = 3
+
+
+def gil_enabled() -> bool:
+    is_enabled = getattr(sys, "_is_gil_enabled", None)
+    return True if is_enabled is None else is_enabled()
+
+
+def chunked(items: Iterable, size: int) -> Iterator[list]:
+    items = iter(items)
+    chunk = list(islice(items, size))
+    while chunk:
+        yield chunk
+        chunk = list(islice(items, size))
+
+
+def _init_worker(rake) -> None:
+    global _worker_rake
+    _worker_rake = rake.precompile()
+
+
+def _worker_extract(doc):
+    return _worker_rake(doc)
+
+
+def map_threads(
+    rake, docs: Iterable, max_workers: int = None, chunksize: int = 16
+) -> List:
+    """
+    Extract keywords from each of `docs` using a pool of threads that share
+    `rake`. Results are in the order of `docs`.
+
+    Args:
+        rake (Rake): the extractor
+
+        docs (Iterable): documents
+
+        max_workers (int|None): number of threads; Default: None, i.e., the
+            `ThreadPoolExecutor` default
+
+        chunksize (int): documents handed to a thread at a time; Default: 16
+
+    Returns:
+        list: one result per document
+    """
+    rake.precompile()
+
+    def extract_chunk(chunk):
+        return [rake(doc) for doc in chunk]
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = executor.map(extract_chunk, chunked(docs, chunksize))
+        return list(chain.from_iterable(results))
+
+
+def map_processes(
+    rake, docs: Iterable, max_workers: int = None, chunksize: int = 16
+) -> List:
+    """
+    Extract keywords from each of `docs` using a pool of processes. `rake`
+    is sent once to each worker rather than with every document. Results
+    are in the order of `docs`.
+
+    Args:
+        rake (Rake): the extractor
+
+        docs (Iterable): documents
+
+        max_workers (int|None): number of processes; Default: None, i.e.,
+            the number of CPUs
+
+        chunksize (int): documents sent to a worker at a time; Default: 16
+
+    Returns:
+        list: one result per document
+    """
+    with ProcessPoolExecutor(
+        max_workers=max_workers, initializer=_init_worker, initargs=(rake,)
+    ) as executor:
+        return list(
+            executor.map(_worker_extract, docs, chunksize=chunksize)
+        )
+
+
+def _serial_match(text: str, splitter: Pattern, pos: int, lo: int):
+    # The first delimiter at or after `pos` is one that `splitter.split()`
+    # would also find, unless a delimiter found by the serial scan straddles
+    # `pos`. In that case, move past the straddling delimiter and retry.
+    while True:
+        match = splitter.search(text, pos)
+        if match is None:
+            return None
+        straddle = None
+        for start in range(max(lo, pos - _MAX_DELIM_LEN + 1), pos):
+            prior = splitter.match(text, start)
+            if prior is not None and prior.end() > pos:
+                straddle = prior
+                break
+        if straddle is None:
+            return match
+        pos = straddle.end()
+
+
+def sentence_spans(text: str, splitter: Pattern, n_chunks: int) -> list:
+    """
+    Cut `text` into about `n_chunks` contiguous spans at sentence delimiters
+    such that splitting each span gives, in order, exactly the sentences of
+    `splitter.split(text)`.
+
+    Returns:
+        list: (start, end) character offsets; delimiters at the cuts are
+            excluded
+    """
+    spans = list()
+    start = 0
+    for k in range(1, n_chunks):
+        pos = max(start, k * len(text) // n_chunks)
+        match = _serial_match(text, splitter, pos, start)
+        if match is None:
+            break
+        spans.append((start, match.start()))
+        start = match.end()
+    spans.append((start, len(text)))
+    return spans
+
+
+def _count_chunk(args):
+    name, offset, size = args
+    shm = SharedMemory(name=name)
+    try:
+        text = bytes(shm.buf[offset : offset + size]).decode("utf-8")
+    finally:
+        shm.close()
+    candidates = _worker_rake._candidates(text)
+    phrase_words = alg.phrase_word_lists(
+        _worker_rake._ngram_filter(candidates), _worker_rake._word_splitter
+    )
+    freq, degree = alg.count_words(phrase_words)
+    # distinct phrases in order of first appearance suffice for scoring;
+    # compact results also need every candidate, in order, for the offsets
+    return (
+        list(dict(phrase_words).items()),
+        dict(freq),
+        dict(degree),
+        candidates if _worker_rake.compact else None,
+    )
+
+
+def extract_document(
+    rake,
+    text: str,
+    max_workers: Optional[int] = None,
+    min_chunk_chars: int = 1 << 20,
+) -> List:
+    """
+    Extract keywords from one large document using a pool of processes.
+    The document is placed in shared memory and cut into contiguous runs of
+    sentences; each worker generates candidates and partial word counts for
+    its run, and the counts are merged and scored here. The result is
+    identical to `rake(text)`.
+
+    Args:
+        rake (Rake): the extractor
+
+        text (str): the document
+
+        max_workers (int|None): number of processes; Default: None, i.e.,
+            the number of CPUs
+
+        min_chunk_chars (int): smallest chunk worth sending to a worker;
+            shorter documents are processed serially; Default: 1 MiB
+
+    Returns:
+        list: same as `rake(text)`
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    n_chunks = 0
+    if isinstance(text, str):
+        n_chunks = min(max_workers, len(text) // min_chunk_chars)
+    if n_chunks < 2:
+        return rake(text)
+
+    spans = sentence_spans(text, rake._sentence_splitter, n_chunks)
+    pieces = [text[start:end].encode("utf-8") for start, end in spans]
+    shm = SharedMemory(create=True, size=max(1, sum(len(p) for p in pieces)))
+    try:
+        tasks = list()
+        offset = 0
+        for piece in pieces:
+            shm.buf[offset : offset + len(piece)] = piece
+            tasks.append((shm.name, offset, len(piece)))
+            offset += len(piece)
+        del pieces
+        logger.debug(f"{len(tasks)} chunks over {max_workers} workers")
+        with ProcessPoolExecutor(
+            max_workers=min(max_workers, len(tasks)),
+            initializer=_init_worker,
+            initargs=(rake,),
+        ) as executor:
+            parts = list(executor.map(_count_chunk, tasks))
+    finally:
+        shm.close()
+        shm.unlink()
+
+    phrase_words = dict()
+    for chunk_phrases, _, _, _ in parts:
+        for phrase, word_list in chunk_phrases:
+            phrase_words.setdefault(phrase, word_list)
+    if not phrase_words:
+        rake._warn_no_keywords()
+        return []
+    freq, degree = alg.merge_counts((f, d) for _, f, d, _ in parts)
+    keyword_candidates = alg.calc_cand_keyword_scores(
+        phrase_words.items(), alg.word_scores(freq, degree)
+    )
+    candidates = None
+    if rake.compact:
+        candidates = chain.from_iterable(c for _, _, _, c in parts)
+    return rake._result(text, rake._ranked(keyword_candidates), candidates)
@@ -0,0 +1,391 @@
+# MIT License
+# Copyright (c) 2017 - 2022, Chris Skiscim
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+Diagnostics for slow extraction.
+
+`profile_corpus` times each stage of the pipeline for every sentence of a
+corpus and keeps the slowest sentences together with their length, number
+of stopword matches, and most frequent matched stopwords. It also times the
+stopword stage with each of the other stopword lists over a fixed-size
+random sample of the sentences, so memory stays bounded on any corpus. The
+report is a JSON-serializable dict; `format_report` renders it as text.
+
+    python -m fast_rake.profiling corpus_dir/ -s smart -o report.json
+"""
+import heapq
+import logging
+import os
+import platform
+import random
+import sys
+import time
+from collections import Counter
+from typing import Iterable, Sequence
+
+import fast_rake.optimized_stop_list as stops
+import fast_rake.rake_alg as alg
+import fast_rake.version as v
+
+logger = logging.getLogger(__name__)
+
+STAGES = ("sentences", "stopwords", "ngrams", "words", "scores")
+
+
+def _timed(fn, *args):
+    start = time.perf_counter()
+    out = fn(*args)
+    return out, time.perf_counter() - start
+
+
+def _stopword_pass(sentences: Sequence[str], stop_re, overlay) -> tuple:
+    n_candidates = 0
+    start = time.perf_counter()
+    for sentence in sentences:
+        phrases = stops.split_on_stopwords(sentence, stop_re, overlay)
+        n_candidates += len(phrases)
+    return time.perf_counter() - start, n_candidates
+
+
+def _matches(sentence: str, stop_re, top: int = 5) -> tuple:
+    found = Counter(
+        m.group(0).strip().lower() for m in stop_re.finditer(sentence)
+    )
+    return sum(found.values()), found.most_common(top)
+
+
+def profile_corpus(
+    docs: Iterable[str],
+    rake=None,
+    top_n: int = 10,
+    alternatives: Sequence[str] = None,
+    repeats: int = 3,
+    sample_size: int = 10000,
+    seed: int = 0,
+) -> dict:
+    """
+    Profile `rake` on `docs`.
+
+    Args:
+        docs (Iterable[str]): documents
+
+        rake (Rake|None): the configuration to profile; Default: None,
+            i.e., `Rake()`
+
+        top_n (int): number of slowest sentences reported; Default: 10
+
+        alternatives (Sequence[str]|None): stopword lists compared with the
+            one of `rake`; Default: None, i.e., all the supported lists
+
+        repeats (int): the stopword comparison keeps the fastest of this
+            many passes per list; Default: 3
+
+        sample_size (int): number of sentences in the uniform sample used
+            for the stopword comparison; Default: 10000
+
+        seed (int): seed of the sample; Default: 0
+
+    Returns:
+        dict: the report
+    """
+    if rake is None:
+        from fast_rake import Rake
+
+        rake = Rake()
+    stop_re = rake.precompile()._stop_words_re
+    overlay = rake._overlay
+    totals = dict.fromkeys(STAGES, 0.0)
+    slowest = list()
+    sample = list()
+    rng = random.Random(seed)
+    n_docs = n_chars = n_sentences = 0
+
+    for doc_idx, doc in enumerate(docs):
+        if not isinstance(doc, str) or not doc.strip():
+            continue
+        n_docs += 1
+        n_chars += len(doc)
+        doc_sentences, secs = _timed(
+            alg.split_sentences, doc, rake._sentence_splitter
+        )
+        totals["sentences"] += secs
+        phrase_words = list()
+        for sent_idx, sentence in enumerate(doc_sentences):
+            phrases, stop_secs = _timed(
+                stops.split_on_stopwords, sentence, stop_re, overlay
+            )
+            kept, ngram_secs = _timed(rake._ngram_filter, phrases)
+            words, word_secs = _timed(
+                alg.phrase_word_lists, kept, rake._word_splitter
+            )
+            totals["stopwords"] += stop_secs
+            totals["ngrams"] += ngram_secs
+            totals["words"] += word_secs
+            phrase_words.extend(words)
+
+            # reservoir sample for the stopword comparison
+            n_sentences += 1
+            if len(sample) < sample_size:
+                sample.append(sentence)
+            else:
+                idx = rng.randrange(n_sentences)
+                if idx < sample_size:
+                    sample[idx] = sentence
+
+            entry = (
+                stop_secs + ngram_secs + word_secs,
+                doc_idx,
+                sent_idx,
+                stop_secs,
+                word_secs,
+                len(phrases),
+                sentence,
+            )
+            if len(slowest) < top_n:
+                heapq.heappush(slowest, entry)
+            elif top_n > 0:
+                heapq.heappushpop(slowest, entry)
+
+        if not phrase_words:
+            continue
+        start = time.perf_counter()
+        freq, degree = alg.count_words(phrase_words)
+        rake._ranked(
+            alg.calc_cand_keyword_scores(
+                phrase_words, alg.word_scores(freq, degree)
+            )
+        )
+        totals["scores"] += time.perf_counter() - start
+
+    slow_report = list()
+    for secs, doc_idx, sent_idx, stop_secs, word_secs, n_cand, sentence in (
+        sorted(slowest, reverse=True)
+    ):
+        n_matches, top_matches = _matches(sentence, stop_re)
+        slow_report.append(
+            {
+                "doc": doc_idx,
+                "sentence": sent_idx,
+                "chars": len(sentence),
+                "seconds": secs,
+                "stopword_seconds": stop_secs,
+                "word_seconds": word_secs,
+                "matches": n_matches,
+                "candidates": n_cand,
+                "top_matches": top_matches,
+                "text": sentence[:200],
+            }
+        )
+
+    if alternatives is None:
+        alternatives = rake.supported_stopwords
+    names = [rake.stop_words] + [
+        name for name in alternatives if name != rake.stop_words
+    ]
+    sample_chars = sum(len(sentence) for sentence in sample)
+    comparison = dict()
+    for name in names:
+        alt_re = stops.load_stopwords(
+            name, rake._regex_customs, no_trailing=True
+        )
+        runs = [
+            _stopword_pass(sample, alt_re, overlay)
+            for _ in range(max(1, repeats))
+        ]
+        secs = min(r[0] for r in runs)
+        comparison[name] = {
+            "seconds": secs,
+            "chars_per_sec": sample_chars / secs if secs else 0.0,
+            "candidates": runs[0][1],
+        }
+    base = comparison[rake.stop_words]["seconds"]
+    for entry in comparison.values():
+        entry["relative"] = entry["seconds"] / base if base else 0.0
+
+    return {
+        "environment": {
+            "fast_rake": v.__version__,
+            "python": sys.version.split()[0],
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+        },
+        "config": {
+            "stopword_name": rake.stop_words,
+            "custom_stopwords": len(rake.custom_stopwords or ()),
+            "stopword_overlay": rake.stopword_overlay,
+            "pattern_chars": len(stop_re.pattern),
+        },
+        "corpus": {
+            "docs": n_docs,
+            "sentences": n_sentences,
+            "chars": n_chars,
+            "sampled_sentences": len(sample),
+        },
+        "stages": totals,
+        "slowest": slow_report,
+        "stopword_lists": comparison,
+    }
+
+
+def format_report(report: dict) -> str:
+    env, config, corpus = (
+        report["environment"],
+        report["config"],
+        report["corpus"],
+    )
+    lines = [
+        "fast_rake {} / {} {} / {}".format(
+            env["fast_rake"],
+            env["implementation"],
+            env["python"],
+            env["platform"],
+        ),
+        "stopwords: {} ({:,} custom, overlay={})".format(
+            config["stopword_name"],
+            config["custom_stopwords"],
+            config["stopword_overlay"],
+        ),
+        "corpus: {:,} docs, {:,} sentences, {:,} chars".format(
+            corpus["docs"], corpus["sentences"], corpus["chars"]
+        ),
+        "",
+        "stage times",
+    ]
+    total = sum(report["stages"].values()) or 1.0
+    for stage, secs in report["stages"].items():
+        lines.append(
+            f"  {stage:>10s}: {secs:9.4f} secs  {100 * secs / total:5.1f}%"
+        )
+    lines += ["", "slowest sentences"]
+    for s in report["slowest"]:
+        top = ", ".join(f"{w!r}x{n}" for w, n in s["top_matches"])
+        lines.append(
+            "  doc {} sent {}: {:.6f} secs, {:,} chars, {:,} matches, "
+            "{:,} candidates; {}".format(
+                s["doc"],
+                s["sentence"],
+                s["seconds"],
+                s["chars"],
+                s["matches"],
+                s["candidates"],
+                top,
+            )
+        )
+        lines.append(f"    {s['text'][:100]!r}")
+    lines += [
+        "",
+        "stopword lists (stopword stage, {:,} sampled sentences)".format(
+            corpus["sampled_sentences"]
+        ),
+    ]
+    for name, c in sorted(
+        report["stopword_lists"].items(), key=lambda kv: kv[1]["seconds"]
+    ):
+        lines.append(
+            "  {:>8s}: {:9.4f} secs  {:5.2f}x  {:,} candidates".format(
+                name, c["seconds"], c["relative"], c["candidates"]
+            )
+        )
+    return "\n".join(lines)
+
+
+def read_corpus(paths: Sequence[str], lines: bool = False) -> Iterable[str]:
+    """
+    Documents from files and directories of `.txt` files, one per file, or
+    one per line if `lines`.
+    """
+    for path in paths:
+        if os.path.isdir(path):
+            files = sorted(
+                os.path.join(root, f)
+                for root, _, names in os.walk(path)
+                for f in names
+                if f.endswith(".txt")
+            )
+        else:
+            files = [path]
+        for file_path in files:
+            with open(file_path, encoding="utf-8", errors="ignore") as fp:
+                if lines:
+                    yield from fp
+                else:
+                    yield fp.read()
+
+
+if __name__ == "__main__":
+    import json
+    from argparse import ArgumentParser
+
+    from fast_rake import Rake
+
+    allowed = ("google", "nltk", "sklearn", "smart")
+
+    parser = ArgumentParser(description="Profile extraction on a corpus")
+    parser.add_argument(
+        "paths", nargs="+", help="text files or directories of .txt files"
+    )
+    parser.add_argument(
+        "-s",
+        "--stopword-name",
+        dest="stopword_name",
+        choices=allowed,
+        default="smart",
+    )
+    parser.add_argument(
+        "-c",
+        "--custom-stopwords",
+        dest="custom_stopwords",
+        default=None,
+        help="file of additional stopwords, one per line",
+    )
+    parser.add_argument(
+        "--lines",
+        dest="lines",
+        action="store_true",
+        help="one document per line",
+    )
+    parser.add_argument(
+        "-n",
+        "--top",
+        dest="top_n",
+        default=10,
+        type=int,
+        help="number of slowest sentences",
+    )
+    parser.add_argument(
+        "-o", "--output", dest="output", default=None, help="JSON report"
+    )
+    args = parser.parse_args()
+
+    custom = None
+    if args.custom_stopwords:
+        with open(args.custom_stopwords, encoding="utf-8") as fp:
+            custom = [w.strip() for w in fp if w.strip()] or None
+    profile_rake = Rake(
+        stopword_name=args.stopword_name, custom_stopwords=custom
+    )
+    result = profile_corpus(
+        read_corpus(args.paths, args.lines), profile_rake, top_n=args.top_n
+    )
+    print(format_report(result))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fp:
+            json.dump(result, fp, indent=2)
@@ -23,13 +23,14 @@ import functools
 import logging
 from collections import defaultdict
 from itertools import chain
-from typing import Pattern, Iterator, List, Tuple
+from typing import Pattern, Iterable, Iterator, List, Tuple
 
 import fast_rake.optimized_stop_list as stops
 
 logger = logging.getLogger(__name__)
 
 PERIOD = "."
+PERIOD_B = b"."
 
 
 def add(x: float, y: float) -> float:
@@ -37,8 +38,9 @@ def add(x: float, y: float) -> float:
 
 
 def is_number(s: str) -> bool:
+    period = PERIOD if isinstance(s, str) else PERIOD_B
     try:
-        float(s) if PERIOD in s else int(s)
+        float(s) if period in s else int(s)
         return True
     except ValueError:
         return False
@@ -56,39 +58,71 @@ def split_sentences(text: str, sentence_delimiters: Pattern) -> List[str]:
     return sentence_delimiters.split(text)
 
 
-def gen_cand_keywords(sentence_list: list, stopword_re: Pattern) -> Iterator:
+def gen_cand_keywords(
+    sentence_list: list, stopword_re: Pattern, cache=None, overlay=None
+) -> Iterator:
+    if cache is not None:
+        return chain.from_iterable(
+            [cache.candidates(s, stopword_re, overlay) for s in sentence_list]
+        )
     return chain.from_iterable(
-        [stops.split_on_stopwords(s, stopword_re) for s in sentence_list]
+        [
+            stops.split_on_stopwords(s, stopword_re, overlay)
+            for s in sentence_list
+        ]
     )
 
 
-def calc_word_scores(
-    phrase_list: list, splitter: Pattern
-) -> Tuple[dict, list]:
+def phrase_word_lists(phrase_list: list, splitter: Pattern) -> list:
+    return [
+        (
+            phrase,
+            [
+                w.strip()
+                for w in splitter.split(phrase)
+                if w.strip() and not is_number(w)
+            ],
+        )
+        for phrase in phrase_list
+    ]
+
+
+def count_words(phrase_words: list) -> Tuple[dict, dict]:
+    # the degree excludes the frequency so that partial counts can be summed
     word_frequency = defaultdict(int)
     word_degree = defaultdict(int)
-    phrase_words = list()
-
-    for phrase in phrase_list:
-        word_list = [
-            w.strip()
-            for w in splitter.split(phrase)
-            if w.strip() and not is_number(w)
-        ]
+    for _, word_list in phrase_words:
         word_list_degree = len(word_list) - 1
-        phrase_words.append((phrase, word_list))
-
         for word in word_list:
             word_frequency[word] += 1
             word_degree[word] += word_list_degree  # orig.
+    return word_frequency, word_degree
 
-    for wf in word_frequency:
-        word_degree[wf] = word_degree[wf] + word_frequency[wf]
 
-    word_score = {
-        w: word_degree[w] / word_frequency[w] for w in word_frequency
+def merge_counts(counts: Iterable[Tuple[dict, dict]]) -> Tuple[dict, dict]:
+    word_frequency = defaultdict(int)
+    word_degree = defaultdict(int)
+    for freq, degree in counts:
+        for word, n in freq.items():
+            word_frequency[word] += n
+        for word, n in degree.items():
+            word_degree[word] += n
+    return word_frequency, word_degree
+
+
+def word_scores(word_frequency: dict, word_degree: dict) -> dict:
+    return {
+        w: (word_degree[w] + word_frequency[w]) / word_frequency[w]
+        for w in word_frequency
     }
-    return word_score, phrase_words
+
+
+def calc_word_scores(
+    phrase_list: list, splitter: Pattern
+) -> Tuple[dict, list]:
+    phrase_words = phrase_word_lists(phrase_list, splitter)
+    word_frequency, word_degree = count_words(phrase_words)
+    return word_scores(word_frequency, word_degree), phrase_words
 
 
 def calc_cand_keyword_scores(phrase_words: list, word_score: dict) -> dict:
@@ -0,0 +1,181 @@
+# MIT License
+# Copyright (c) 2017 - 2022, Chris Skiscim
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+A compact, read-only container for the output of `Rake(compact=True)`.
+
+Instead of a tuple, a `str`, and a `float` per keyword, a `KeywordList`
+keeps a reference to the source text, the start and length of each keyword
+in it, and the scores, in arrays. Keyword strings are created when accessed.
+"""
+from array import array
+from collections.abc import Sequence
+from typing import Iterable, List, Optional
+
+
+class KeywordList(Sequence):
+    """
+    Ranked keywords as spans of the source text. Indexing and iteration give
+    the same items as the list returned by default, i.e., (keyword, score)
+    tuples, or keywords if `kw_only`, and a `KeywordList` compares equal to
+    that list. The source text is kept alive as long as the result.
+
+    Keywords that are not a verbatim substring of the text are stored as
+    strings.
+    """
+
+    __slots__ = ("_text", "_starts", "_lens", "_scores", "_extra", "kw_only")
+
+    def __init__(
+        self,
+        text,
+        starts: array,
+        lens: array,
+        scores: Optional[array],
+        extra: list,
+        kw_only: bool,
+    ) -> None:
+        self._text = text
+        self._starts = starts
+        self._lens = lens
+        self._scores = scores
+        self._extra = extra
+        self.kw_only = kw_only
+
+    @classmethod
+    def from_ranked(
+        cls, text, ranked: list, kw_only: bool, phrases: Iterable = None
+    ) -> "KeywordList":
+        """
+        Args:
+            text (str|bytes): the source text
+
+            ranked (list): output of `Rake._ranked()`
+
+            kw_only (bool): `ranked` holds keywords without scores
+
+            phrases (Iterable|None): candidate phrases in the order they
+                appear in `text`, used to find all the offsets in one scan;
+                if None, each keyword is searched for separately
+        """
+        if isinstance(text, (bytearray, memoryview)):
+            text = bytes(text)
+        first = dict()
+        if phrases is not None:
+            cursor = 0
+            for phrase in phrases:
+                if phrase in first:
+                    continue
+                pos = text.find(phrase, cursor)
+                if pos >= 0:
+                    first[phrase] = pos
+                    cursor = pos + len(phrase)
+
+        keywords = ranked if kw_only else [kw for kw, _ in ranked]
+        starts, lens, extra = array("q"), array("I"), list()
+        for kw in keywords:
+            pos = first.get(kw)
+            if pos is None:
+                pos = text.find(kw)
+            if pos < 0:
+                pos = -1 - len(extra)
+                extra.append(kw)
+            starts.append(pos)
+            lens.append(len(kw))
+        scores = None
+        if not kw_only:
+            scores = array("d", (score for _, score in ranked))
+        return cls(text, starts, lens, scores, extra, kw_only)
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def keyword(self, idx: int):
+        start = self._starts[idx]
+        if start < 0:
+            return self._extra[-1 - start]
+        return self._text[start : start + self._lens[idx]]
+
+    def score(self, idx: int) -> float:
+        if self._scores is None:
+            raise ValueError("no scores with kw_only=True")
+        return self._scores[idx]
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return KeywordList(
+                self._text,
+                self._starts[idx],
+                self._lens[idx],
+                None if self._scores is None else self._scores[idx],
+                self._extra,
+                self.kw_only,
+            )
+        if self.kw_only:
+            return self.keyword(idx)
+        return self.keyword(idx), self._scores[idx]
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (KeywordList, list)):
+            return len(self) == len(other) and all(
+                a == b for a, b in zip(self, other)
+            )
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return "{}({!r})".format(self.__class__.__name__, self.to_list())
+
+    def offsets(self) -> List[tuple]:
+        """
+        (start, end) of each keyword in the source text, or None for the
+        keywords stored as strings.
+        """
+        return [
+            None if start < 0 else (start, start + length)
+            for start, length in zip(self._starts, self._lens)
+        ]
+
+    def to_list(self) -> list:
+        return list(self)
+
+    def to_numpy(self):
+        """
+        The scores as a `numpy.ndarray` sharing this object's memory.
+        Requires `numpy`.
+
+        Raises:
+            ValueError if the keywords have no scores
+        """
+        import numpy as np
+
+        if self._scores is None:
+            raise ValueError("no scores with kw_only=True")
+        return np.frombuffer(self._scores, dtype=np.float64)
+
+
+def as_list(result) -> list:
+    """
+    `result.to_list()` for a `KeywordList`, e.g., before JSON encoding;
+    other results are returned as they are.
+    """
+    if isinstance(result, KeywordList):
+        return result.to_list()
+    return result
@@ -0,0 +1,249 @@
+# MIT License
+# Copyright (c) 2017 - 2022, Chris Skiscim
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+Length-aware scheduling of documents over a process pool.
+
+The cost of a document is estimated from its length with a linear model
+calibrated on this machine. Documents costing more than a batch target are
+sent on their own; the rest are packed into batches of about the target
+cost. Batches are dispatched largest first, so the long documents do not land
+at the end of the run and leave the other workers idle.
+"""
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import List, Sequence, Tuple
+
+import fast_rake.parallel as par
+
+logger = logging.getLogger(__name__)
+
+_SAMPLE = (
+    "Compatibility of systems of linear constraints over the set of natural "
+    "numbers. Criteria of compatibility of a system of linear Diophantine "
+    "equations, strict inequations, and nonstrict inequations are "
+    "considered. Upper bounds for components of a minimal set of solutions "
+    "and algorithms of construction of minimal generating sets of solutions "
+    "for all types of systems are given. "
+)
+
+
+def _synthetic(size: int) -> str:
+    return (_SAMPLE * (size // len(_SAMPLE) + 1))[:size]
+
+
+class CostModel:
+    """
+    Estimated seconds to extract keywords from a document of `n` characters,
+    `intercept + per_char * n`.
+    """
+
+    __slots__ = ("intercept", "per_char")
+
+    def __init__(self, intercept: float, per_char: float) -> None:
+        self.intercept = max(0.0, intercept)
+        self.per_char = max(0.0, per_char)
+
+    def __repr__(self) -> str:
+        return "{}(intercept={:.3g}, per_char={:.3g})".format(
+            self.__class__.__name__, self.intercept, self.per_char
+        )
+
+    def cost(self, n_chars: int) -> float:
+        return self.intercept + self.per_char * n_chars
+
+    def to_dict(self) -> dict:
+        return {"intercept": self.intercept, "per_char": self.per_char}
+
+    @classmethod
+    def from_dict(cls, params: dict) -> "CostModel":
+        return cls(params["intercept"], params["per_char"])
+
+    @classmethod
+    def calibrate(
+        cls,
+        rake,
+        sizes: Sequence[int] = (100, 1000, 10000, 50000),
+        repeats: int = 3,
+    ) -> "CostModel":
+        """
+        Time `rake` on synthetic documents of each size and fit the model by
+        least squares, using the fastest of `repeats` runs per size.
+        """
+        rake.precompile()
+        xs, ys = list(), list()
+        for size in sizes:
+            doc = _synthetic(size)
+            best = float("inf")
+            for _ in range(repeats):
+                start = time.perf_counter()
+                rake(doc)
+                best = min(best, time.perf_counter() - start)
+            xs.append(size)
+            ys.append(best)
+        model = cls.fit(xs, ys)
+        logger.info(f"calibrated {model}")
+        return model
+
+    @classmethod
+    def fit(
+        cls, sizes: Sequence[int], seconds: Sequence[float]
+    ) -> "CostModel":
+        """
+        Least squares fit of the model to measured times.
+        """
+        n = len(sizes)
+        mean_x, mean_y = sum(sizes) / n, sum(seconds) / n
+        var_x = sum((x - mean_x) ** 2 for x in sizes)
+        cov_xy = sum(
+            (x - mean_x) * (y - mean_y) for x, y in zip(sizes, seconds)
+        )
+        slope = cov_xy / var_x if var_x else 0.0
+        return cls(mean_y - slope * mean_x, slope)
+
+
+def plan_batches(
+    lengths: Sequence[int],
+    n_workers: int,
+    cost_model: CostModel,
+    batches_per_worker: int = 4,
+) -> List[List[int]]:
+    """
+    Group document indices into batches of roughly equal estimated cost.
+
+    Args:
+        lengths (Sequence[int]): document lengths, in characters
+
+        n_workers (int): number of workers
+
+        cost_model (CostModel): cost estimate
+
+        batches_per_worker (int): the target batch cost is the total cost
+            divided by `n_workers * batches_per_worker`; Default: 4
+
+    Returns:
+        list(list(int)): batches in dispatch order, i.e., by decreasing cost
+    """
+    if not lengths:
+        return list()
+    costs = [cost_model.cost(n) for n in lengths]
+    target = sum(costs) / max(1, n_workers * batches_per_worker)
+    order = sorted(range(len(lengths)), key=costs.__getitem__, reverse=True)
+
+    batches = list()
+    batch, batch_cost = list(), 0.0
+    for idx in order:
+        if costs[idx] >= target:
+            batches.append(([idx], costs[idx]))
+            continue
+        batch.append(idx)
+        batch_cost += costs[idx]
+        if batch_cost >= target:
+            batches.append((batch, batch_cost))
+            batch, batch_cost = list(), 0.0
+    if batch:
+        batches.append((batch, batch_cost))
+    batches.sort(key=lambda b: b[1], reverse=True)
+    return [indices for indices, _ in batches]
+
+
+def _run_batch(batch: List[Tuple[int, str]]) -> tuple:
+    start = time.perf_counter()
+    results = [(idx, par._worker_extract(doc)) for idx, doc in batch]
+    return os.getpid(), time.perf_counter() - start, results
+
+
+def map_scheduled(
+    rake,
+    docs: Sequence[str],
+    max_workers: int = None,
+    cost_model: CostModel = None,
+    batches_per_worker: int = 4,
+) -> Tuple[List, dict]:
+    """
+    Extract keywords from each of `docs` on a process pool, using
+    `plan_batches` for the order and grouping of the work.
+
+    Args:
+        rake (Rake): the extractor
+
+        docs (Sequence[str]): documents
+
+        max_workers (int|None): number of processes; Default: None, i.e.,
+            the number of CPUs
+
+        cost_model (CostModel|None): Default: None, i.e., calibrate `rake`
+            on this machine
+
+        batches_per_worker (int): see `plan_batches`; Default: 4
+
+    Returns:
+        tuple(list, dict): one result per document, in order, and a report
+            of wall time and per-worker busy time and utilization
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    if cost_model is None:
+        cost_model = CostModel.calibrate(rake)
+    lengths = [len(doc) if isinstance(doc, str) else 0 for doc in docs]
+    batches = plan_batches(
+        lengths, max_workers, cost_model, batches_per_worker
+    )
+
+    results = [None] * len(docs)
+    workers = dict()
+    start = time.perf_counter()
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        initializer=par._init_worker,
+        initargs=(rake,),
+    ) as executor:
+        futures = [
+            executor.submit(_run_batch, [(idx, docs[idx]) for idx in batch])
+            for batch in batches
+        ]
+        for future in as_completed(futures):
+            pid, busy, batch_results = future.result()
+            for idx, result in batch_results:
+                results[idx] = result
+            stats = workers.setdefault(
+                pid, {"busy": 0.0, "batches": 0, "docs": 0}
+            )
+            stats["busy"] += busy
+            stats["batches"] += 1
+            stats["docs"] += len(batch_results)
+    wall = time.perf_counter() - start
+
+    for stats in workers.values():
+        stats["utilization"] = stats["busy"] / wall if wall else 0.0
+    report = {
+        "wall": wall,
+        "batches": len(batches),
+        "cost_model": cost_model.to_dict(),
+        "workers": workers,
+    }
+    logger.info(
+        "{:,} docs in {:,} batches; {:0.3f} secs".format(
+            len(docs), len(batches), wall
+        )
+    )
+    return results, report
@@ -0,0 +1,429 @@
+# MIT License
+# Copyright (c) 2017 - 2022, Chris Skiscim
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+usage: python -m fast_rake.serve [-h] [--host HOST] [-p PORT] [-w WORKERS]
+                                 [-s STOPWORD_NAME [STOPWORD_NAME ...]]
+                                 [-b MAX_BATCH] [-t MAX_WAIT_MS] [-q MAX_QUEUE]
+
+Local keyword extraction service. Worker processes hold compiled `Rake`
+instances, one per configured stopword list. Concurrent requests are grouped
+into micro-batches, each sent to a worker once it is full or its oldest
+document has waited `max_wait` seconds. The request queue and the number of
+batches in flight are bounded; when the queue is full, or the service is not
+running, requests are rejected with 503.
+
+Endpoints:
+    POST /extract   {"text": str} or {"texts": [str]}, optionally with
+                    "config": name; returns {"keywords": [...]} or
+                    {"results": [[...]]}
+    GET  /stats     queue depth, batch sizes, and latency percentiles
+    GET  /healthz   liveness
+"""
+import json
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+
+from fast_rake.result import as_list
+
+logger = logging.getLogger(__name__)
+
+# Rake instances in a worker process, by configuration name
+_worker_rakes = None
+
+
+def _init_worker(configs: Dict[str, dict]) -> None:
+    global _worker_rakes
+    from fast_rake import Rake
+
+    _worker_rakes = {
+        name: Rake(**kwargs).precompile() for name, kwargs in configs.items()
+    }
+
+
+def _ping() -> bool:
+    return True
+
+
+def _extract_batch(items: List[tuple]) -> list:
+    return [as_list(_worker_rakes[name](text)) for name, text in items]
+
+
+def _percentile(ordered: list, q: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class ExtractionService:
+    """
+    Micro-batching front end to a pool of prewarmed worker processes.
+
+    Args:
+        configs (dict|None): configuration name -> `Rake` keyword arguments;
+            Default: one configuration per built-in stopword list, named
+            after the list
+
+        n_workers (int): number of worker processes; Default: 2
+
+        max_batch (int): most documents in a batch; Default: 32
+
+        max_wait (float): longest time, in seconds, a document waits for
+            its batch to fill; Default: 0.005
+
+        max_queue (int): most documents waiting to be batched; Default: 1024
+
+        stats_window (int): number of recent latencies kept for percentiles;
+            Default: 10000
+    """
+
+    def __init__(
+        self,
+        configs: Dict[str, dict] = None,
+        n_workers: int = 2,
+        max_batch: int = 32,
+        max_wait: float = 0.005,
+        max_queue: int = 1024,
+        stats_window: int = 10000,
+    ) -> None:
+        if configs is None:
+            configs = {
+                name: {"stopword_name": name}
+                for name in ("google", "nltk", "sklearn", "smart")
+            }
+        if not configs:
+            raise ValueError("at least one configuration is required")
+        if max_batch < 1 or max_queue < 1 or n_workers < 1:
+            raise ValueError("n_workers, max_batch, max_queue must be > 0")
+
+        self.configs = configs
+        self.default_config = next(iter(configs))
+        if "smart" in configs:
+            self.default_config = "smart"
+        self.n_workers = n_workers
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+
+        self._queue = queue.Queue(maxsize=max_queue)
+        # at most two batches per worker in flight; the rest wait in _queue
+        self._in_flight = threading.BoundedSemaphore(2 * n_workers)
+        self._executor = None
+        self._batcher = None
+        self._running = threading.Event()
+
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=stats_window)
+        self._batch_sizes = deque(maxlen=stats_window)
+        self._n_docs = 0
+        self._n_rejected = 0
+        self._n_batches = 0
+
+    def start(self) -> "ExtractionService":
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.n_workers,
+            initializer=_init_worker,
+            initargs=(self.configs,),
+        )
+        # spawn and warm every worker before taking traffic
+        warm = [self._executor.submit(_ping) for _ in range(self.n_workers)]
+        for future in warm:
+            future.result()
+        self._running.set()
+        self._batcher = threading.Thread(
+            target=self._batch_loop, name="fast-rake-batcher", daemon=True
+        )
+        self._batcher.start()
+        logger.info(f"extraction service started; {self.n_workers} workers")
+        return self
+
+    def stop(self) -> None:
+        self._running.clear()
+        if self._batcher is not None:
+            self._batcher.join()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+
+    def __enter__(self) -> "ExtractionService":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def submit(self, text: str, config: str = None) -> Future:
+        """
+        Queue one document for extraction.
+
+        Args:
+            text (str): the document
+
+            config (str|None): configuration name; Default: the `smart`
+                configuration if present, else the first one
+
+        Returns:
+            Future: resolves to the `Rake` output
+
+        Raises:
+            KeyError if `config` is unknown
+
+            queue.Full if the request queue is full
+
+            RuntimeError if the service is not running
+        """
+        if not self._running.is_set():
+            raise RuntimeError("extraction service is not running")
+        config = config or self.default_config
+        if config not in self.configs:
+            raise KeyError(config)
+        future = Future()
+        try:
+            self._queue.put_nowait((config, text, future, time.monotonic()))
+        except queue.Full:
+            with self._lock:
+                self._n_rejected += 1
+            raise
+        return future
+
+    def _batch_loop(self) -> None:
+        while self._running.is_set():
+            try:
+                batch = [self._queue.get(timeout=0.1)]
+            except queue.Empty:
+                continue
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            items = [(config, text) for config, text, _, _ in batch]
+            self._in_flight.acquire()
+            try:
+                task = self._executor.submit(_extract_batch, items)
+            except RuntimeError as e:
+                self._in_flight.release()
+                self._fail(batch, e)
+                continue
+            task.add_done_callback(
+                lambda done, batch=batch: self._resolve(batch, done)
+            )
+        # fail whatever is still waiting
+        pending = list()
+        while not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+        self._fail(pending, RuntimeError("extraction service stopped"))
+
+    @staticmethod
+    def _fail(batch: list, error: BaseException) -> None:
+        for _, _, future, _ in batch:
+            future.set_exception(error)
+
+    def _resolve(self, batch: list, done: Future) -> None:
+        self._in_flight.release()
+        now = time.monotonic()
+        error = done.exception()
+        with self._lock:
+            self._n_batches += 1
+            self._n_docs += len(batch)
+            self._batch_sizes.append(len(batch))
+            self._latencies.extend(now - t for _, _, _, t in batch)
+        if error is not None:
+            self._fail(batch, error)
+            return
+        for (_, _, future, _), result in zip(batch, done.result()):
+            future.set_result(result)
+
+    def stats(self) -> dict:
+        with self._lock:
+            latencies = sorted(self._latencies)
+            sizes = list(self._batch_sizes)
+            stats = {
+                "queue_depth": self._queue.qsize(),
+                "documents": self._n_docs,
+                "rejected": self._n_rejected,
+                "batches": self._n_batches,
+            }
+        stats["batch_size"] = {
+            "mean": sum(sizes) / len(sizes) if sizes else 0.0,
+            "max": max(sizes, default=0),
+        }
+        stats["latency_ms"] = {
+            f"p{int(100 * q)}": 1000.0 * _percentile(latencies, q)
+            for q in (0.5, 0.9, 0.99)
+        }
+        return stats
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "fast-rake"
+
+    def log_message(self, fmt, *args) -> None:
+        logger.debug(fmt % args)
+
+    def _reply(self, status: int, body: dict) -> None:
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self) -> None:
+        if self.path == "/stats":
+            self._reply(200, self.server.service.stats())
+        elif self.path == "/healthz":
+            self._reply(200, {"status": "ok"})
+        else:
+            self._reply(404, {"error": f"no endpoint {self.path}"})
+
+    def do_POST(self) -> None:
+        if self.path != "/extract":
+            self._reply(404, {"error": f"no endpoint {self.path}"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length))
+            single = "text" in request
+            texts = [request["text"]] if single else list(request["texts"])
+            config = request.get("config")
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            self._reply(400, {"error": f"bad request; {e!r}"})
+            return
+
+        service = self.server.service
+        try:
+            futures = [service.submit(text, config) for text in texts]
+        except KeyError:
+            self._reply(400, {"error": f"unknown config {config}"})
+            return
+        except queue.Full:
+            self._reply(503, {"error": "queue full; retry later"})
+            return
+        except RuntimeError as e:
+            self._reply(503, {"error": str(e)})
+            return
+        try:
+            timeout = self.server.request_timeout
+            results = [f.result(timeout=timeout) for f in futures]
+        except Exception as e:  # noqa
+            logger.exception(e)
+            self._reply(500, {"error": repr(e)})
+            return
+        if single:
+            self._reply(200, {"keywords": results[0]})
+        else:
+            self._reply(200, {"results": results})
+
+
+def make_server(
+    service: ExtractionService,
+    host: str = "127.0.0.1",
+    port: int = 8080,
+    timeout: float = 30.0,
+) -> ThreadingHTTPServer:
+    """
+    HTTP front end for a started `service`. Use `port=0` to pick a free
+    port; the address is in `server.server_address`.
+    """
+    server = ThreadingHTTPServer((host, port), _Handler)
+    server.daemon_threads = True
+    server.service = service
+    server.request_timeout = timeout
+    return server
+
+
+if __name__ == "__main__":
+    from argparse import ArgumentParser
+
+    allowed = ("google", "nltk", "sklearn", "smart")
+
+    parser = ArgumentParser(description="Local keyword extraction service")
+    parser.add_argument("--host", dest="host", default="127.0.0.1")
+    parser.add_argument(
+        "-p", "--port", dest="port", default=8080, type=int, help="port"
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        dest="workers",
+        default=2,
+        type=int,
+        help="number of worker processes",
+    )
+    parser.add_argument(
+        "-s",
+        "--stopword-name",
+        dest="stopword_name",
+        nargs="+",
+        choices=allowed,
+        default=list(allowed),
+        help="stopword lists to serve; each is a configuration",
+    )
+    parser.add_argument(
+        "-b",
+        "--max-batch",
+        dest="max_batch",
+        default=32,
+        type=int,
+        help="most documents in a batch",
+    )
+    parser.add_argument(
+        "-t",
+        "--max-wait-ms",
+        dest="max_wait_ms",
+        default=5.0,
+        type=float,
+        help="longest wait for a batch to fill, in milliseconds",
+    )
+    parser.add_argument(
+        "-q",
+        "--max-queue",
+        dest="max_queue",
+        default=1024,
+        type=int,
+        help="most documents waiting to be batched",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    with ExtractionService(
+        configs={name: {"stopword_name": name} for name in args.stopword_name},
+        n_workers=args.workers,
+        max_batch=args.max_batch,
+        max_wait=args.max_wait_ms / 1000.0,
+        max_queue=args.max_queue,
+    ) as extraction_service:
+        httpd = make_server(extraction_service, args.host, args.port)
+        logger.info("serving on {}:{}".format(*httpd.server_address))
+        try:
+            httpd.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            httpd.server_close()
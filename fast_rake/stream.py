@@ -0,0 +1,212 @@
+# MIT License
+# Copyright (c) 2017 - 2022, Chris Skiscim
+#
+# Permission is hereby granted, free of charge, to any person obtaining
+# a copy of this software and associated documentation files (the
+# "Software"), to deal in the Software without restriction, including
+# without limitation the rights to use, copy, modify, merge, publish,
+# distribute, sublicense, and/or sell copies of the Software, and to
+# permit persons to whom the Software is furnished to do so, subject to
+# the following conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF
+# MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT HOLDERS BE
+# LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY, WHETHER IN AN ACTION
+# OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION
+# WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE SOFTWARE.
+"""
+Approximate top keywords over an unbounded stream of `Rake` results.
+
+`SpaceSaving` keeps at most `capacity` counters (Metwally, et al., 2005).
+For every tracked keyword the reported count over-estimates the true count by
+at most the reported error, and any keyword occurring more than
+`total / capacity` times is tracked. Summaries built by different workers can
+be merged (Agarwal, et al., 2012).
+
+Increments are a dictionary update; the min-heap used for eviction is only
+repaired lazily when a counter has to be replaced. Optional exponential time
+decay uses forward decay: new weight grows by `1 / decay` at every `tick()`
+instead of shrinking every stored counter.
+"""
+import heapq
+import itertools
+import math
+from typing import Iterable, List, Tuple
+
+# rescale the forward-decay weights before they overflow
+_LOG_MAX_SCALE = math.log(1e100)
+
+
+class SpaceSaving:
+    """
+    Args:
+        capacity (int): most keywords tracked; Default: 1000
+
+        decay (float): in (0, 1]; the weight of past updates is multiplied
+            by `decay` at every `tick()`; Default: 1.0, i.e., no decay
+
+    Raises:
+        ValueError if arguments are incorrect
+    """
+
+    def __init__(self, capacity: int = 1000, decay: float = 1.0) -> None:
+        if capacity < 1:
+            raise ValueError(f"capacity must be > 0, got {capacity}")
+        if not 0.0 < decay <= 1.0:
+            raise ValueError(f"decay must be in (0, 1], got {decay}")
+        self.capacity = capacity
+        self.decay = decay
+        # keyword -> [count, error, score sum], all in units of _scale
+        self._counters = dict()
+        # (count, seq, keyword); a count may be stale, i.e., too low
+        self._heap = list()
+        self._seq = itertools.count()
+        self._scale = 1.0
+        self._total = 0.0
+
+    def __len__(self) -> int:
+        return len(self._counters)
+
+    def __contains__(self, keyword) -> bool:
+        return keyword in self._counters
+
+    @property
+    def total(self) -> float:
+        """(decayed) number of keywords seen"""
+        return self._total / self._scale
+
+    @property
+    def error_bound(self) -> float:
+        """largest possible over-estimate of any count"""
+        return self.total / self.capacity
+
+    def update(self, keywords: Iterable) -> None:
+        """
+        Add the output of one `Rake` call, i.e., (keyword, score) pairs or,
+        for `kw_only=True`, keywords.
+        """
+        weight = self._scale
+        counters = self._counters
+        for item in keywords:
+            if isinstance(item, tuple):
+                keyword, score = item
+            else:
+                keyword, score = item, 0.0
+            self._total += weight
+            counter = counters.get(keyword)
+            if counter is not None:
+                counter[0] += weight
+                counter[2] += score * weight
+            elif len(counters) < self.capacity:
+                counters[keyword] = [weight, 0.0, score * weight]
+                heapq.heappush(self._heap, (weight, next(self._seq), keyword))
+            else:
+                floor = self._evict()
+                counters[keyword] = [floor + weight, floor, score * weight]
+                heapq.heappush(
+                    self._heap, (floor + weight, next(self._seq), keyword)
+                )
+
+    def _evict(self) -> float:
+        # Heap keys never exceed the true counts, so a popped key that is
+        # current is the minimum; stale keys are refreshed and pushed back.
+        while True:
+            count, seq, keyword = heapq.heappop(self._heap)
+            current = self._counters[keyword][0]
+            if current == count:
+                del self._counters[keyword]
+                return count
+            heapq.heappush(self._heap, (current, seq, keyword))
+
+    def tick(self, n: int = 1) -> None:
+        """Advance time by `n` steps, decaying all past updates."""
+        if self.decay == 1.0:
+            return
+        # in log space, so that a long gap cannot overflow the scale
+        log_scale = math.log(self._scale) - n * math.log(self.decay)
+        if log_scale > _LOG_MAX_SCALE:
+            # values long past may underflow to 0, which is their weight
+            self._rescale(math.exp(-log_scale))
+        else:
+            self._scale = math.exp(log_scale)
+
+    def _rescale(self, factor: float) -> None:
+        # multiply the stored values by `factor` and reset the scale to 1
+        for counter in self._counters.values():
+            counter[0] *= factor
+            counter[1] *= factor
+            counter[2] *= factor
+        self._total *= factor
+        self._scale = 1.0
+        self._rebuild_heap()
+
+    def _rebuild_heap(self) -> None:
+        self._heap = [
+            (counter[0], next(self._seq), keyword)
+            for keyword, counter in self._counters.items()
+        ]
+        heapq.heapify(self._heap)
+
+    def top(self, n: int = None) -> List[Tuple]:
+        """
+        The `n` keywords with the largest estimated counts.
+
+        Returns:
+            list(tuple): (keyword, count, error, score sum); the true count
+                is in [count - error, count]
+        """
+        scale = self._scale
+        items = [
+            (kw, c[0] / scale, c[1] / scale, c[2] / scale)
+            for kw, c in self._counters.items()
+        ]
+        if n is None:
+            return sorted(items, key=lambda item: item[1], reverse=True)
+        return heapq.nlargest(n, items, key=lambda item: item[1])
+
+    def merge(self, other: "SpaceSaving") -> "SpaceSaving":
+        """
+        Combine two summaries taken at the same time step into a new one.
+        A keyword missing from a full summary may have occurred up to that
+        summary's minimum count, which is added to its count and error.
+
+        Raises:
+            ValueError if the capacities or decay rates differ
+        """
+        if (self.capacity, self.decay) != (other.capacity, other.decay):
+            raise ValueError("summaries must have the same capacity and decay")
+        floors = [s._floor() for s in (self, other)]
+        merged = dict()
+        for summary in (self, other):
+            for keyword in summary._counters:
+                merged.setdefault(keyword, [0.0, 0.0, 0.0])
+        for keyword, counter in merged.items():
+            for summary, floor in zip((self, other), floors):
+                found = summary._counters.get(keyword)
+                if found is None:
+                    counter[0] += floor
+                    counter[1] += floor
+                else:
+                    counter[0] += found[0] / summary._scale
+                    counter[1] += found[1] / summary._scale
+                    counter[2] += found[2] / summary._scale
+
+        result = SpaceSaving(self.capacity, self.decay)
+        kept = heapq.nlargest(
+            self.capacity, merged.items(), key=lambda item: item[1][0]
+        )
+        result._counters = dict(kept)
+        result._total = self.total + other.total
+        result._rebuild_heap()
+        return result
+
+    def _floor(self) -> float:
+        # the count any untracked keyword may have had, in read units
+        if len(self._counters) < self.capacity:
+            return 0.0
+        return min(c[0] for c in self._counters.values()) / self._scale
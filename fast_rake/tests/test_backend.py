@@ -0,0 +1,68 @@
+"""
+Automatic backend selection
+"""
+import json
+
+import pytest
+
+import fast_rake.version as v
+from fast_rake import Rake
+from fast_rake.backend import AutoBackend, map_auto
+from fast_rake.schedule import CostModel, _synthetic
+
+
+@pytest.fixture
+def profile(tmp_path, monkeypatch):
+    path = tmp_path / "profile.json"
+    monkeypatch.setenv("FAST_RAKE_PROFILE", str(path))
+    return path
+
+
+def test_calibrates_once(profile, text, monkeypatch):
+    rake = Rake(backend="auto")
+    rake.backend = AutoBackend(max_workers=1)
+    assert rake(text) == Rake()(text)
+    info = rake.backend_info()
+    assert info["serial"]["per_char"] > 0
+    assert info["decisions"] == {"serial": 1}
+    assert profile.is_file()
+
+    def fail(*args, **kwargs):
+        raise AssertionError("calibrated again")
+
+    monkeypatch.setattr(CostModel, "calibrate", fail)
+    rake = Rake(backend="auto")
+    rake.backend = AutoBackend(max_workers=1)
+    assert rake(text) == Rake()(text)
+    assert rake.backend_info()["serial"] == info["serial"]
+
+
+def test_routes_by_length(profile, text):
+    serial = CostModel(0.0, 1e-6)
+    document = CostModel(0.25, 1e-7)
+    entry = {"serial": serial.to_dict(), "document": document.to_dict()}
+    profile.write_text(
+        json.dumps(
+            {"version": v.__version__, "profiles": {"smart/0/2": entry}}
+        )
+    )
+    rake = Rake(backend="auto")
+    rake.backend = AutoBackend(max_workers=2)
+    big = _synthetic(400_000)
+
+    assert rake(text) == Rake()(text)
+    assert rake(big) == Rake()(big)
+    info = rake.backend_info()
+    assert 250_000 < info["threshold"] < 300_000
+    assert info["decisions"] == {"serial": 1, "document": 1}
+
+    assert map_auto(rake, [text] * 3) == [Rake()(text)] * 3
+    assert rake.backend_info()["decisions"]["batch-serial"] == 1
+
+
+def test_serial_default(text):
+    rake = Rake()
+    assert rake.backend_info() == dict()
+    assert map_auto(rake, [text]) == [rake(text)]
+    with pytest.raises(ValueError):
+        Rake(backend="fastest")
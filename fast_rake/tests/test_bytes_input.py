@@ -0,0 +1,37 @@
+"""
+UTF-8 bytes input
+"""
+import pytest
+
+from fast_rake import Rake
+
+
+def decoded(keywords):
+    return [(kw.decode("utf-8"), score) for kw, score in keywords]
+
+
+@pytest.mark.parametrize("stop_name", ["google", "nltk", "sklearn", "smart"])
+def test_same_as_str(text, long_text, stop_name):
+    rake = Rake(stopword_name=stop_name, custom_stopwords=["kaggle"])
+    for doc in (text, long_text):
+        assert decoded(rake(doc.encode("utf-8"))) == rake(doc)
+
+
+@pytest.mark.parametrize("wrap", [bytes, bytearray, memoryview])
+def test_buffer_types(med_text, wrap):
+    rake = Rake(ngram_range=(1, 3), kw_only=True)
+    result = rake(wrap(med_text.encode("utf-8")))
+    assert [kw.decode("utf-8") for kw in result] == rake(med_text)
+
+
+def test_non_ascii_delimiters():
+    rake = Rake(kw_only=True)
+    doc = "Kaggle’s platform – data science café competitions"
+    result = rake(doc.encode("utf-8"))
+    assert all(isinstance(kw, bytes) for kw in result)
+    assert b"Kaggle" in result
+
+
+@pytest.mark.parametrize("bad_text", [b"", b" \t\n"])
+def test_empty(bad_text):
+    assert Rake()(bad_text) == []
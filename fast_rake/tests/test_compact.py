@@ -0,0 +1,64 @@
+"""
+Compact results
+"""
+import pickle
+
+import pytest
+
+from fast_rake import Rake
+from fast_rake.result import KeywordList
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        dict(),
+        dict(kw_only=True),
+        dict(ngram_range=(1, 2), max_kw=10),
+        dict(merge_variants=True),
+        dict(custom_stopwords=["data"], stopword_overlay=True),
+    ],
+)
+def test_same_as_list(long_text, med_text, kwargs):
+    for text in (long_text, med_text, long_text.encode("utf-8")):
+        expected = Rake(**kwargs)(text)
+        result = Rake(compact=True, **kwargs)(text)
+        assert isinstance(result, KeywordList)
+        assert result == expected
+        assert result.to_list() == expected
+        assert list(result) == expected
+        assert result[:3] == expected[:3]
+        assert result[-1] == expected[-1]
+        assert len(result) == len(expected)
+
+
+def test_offsets(long_text):
+    result = Rake(compact=True)(long_text)
+    assert not result._extra
+    for (kw, _), (start, end) in zip(result, result.offsets()):
+        assert long_text[start:end] == kw
+    assert pickle.loads(pickle.dumps(result)) == result
+
+
+def test_not_a_substring():
+    result = KeywordList.from_ranked("lifeboat", [("eels", 1.0)], False)
+    assert result == [("eels", 1.0)]
+    assert result.offsets() == [None]
+
+
+def test_to_numpy(text):
+    np = pytest.importorskip("numpy")
+    result = Rake(compact=True)(text)
+    scores = result.to_numpy()
+    assert isinstance(scores, np.ndarray)
+    assert scores.tolist() == [s for _, s in result]
+    with pytest.raises(ValueError):
+        Rake(compact=True, kw_only=True)(text).to_numpy()
+
+
+def test_offsets_with_ngram_range():
+    # "eels" must not be found inside the filtered-out first phrase
+    text = "Electric eels travel south. eels, lifeboat."
+    result = Rake(compact=True, ngram_range=(1, 1))(text)
+    assert result == [("eels", 1.0), ("lifeboat", 1.0)]
+    assert result.offsets() == [(28, 32), (34, 42)]
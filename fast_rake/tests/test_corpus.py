@@ -0,0 +1,89 @@
+"""
+Checkpointed corpus runs
+"""
+import os
+
+import pytest
+
+from fast_rake import Rake
+from fast_rake.corpus import chunk_name, iter_results, run_corpus
+from fast_rake.idf import IdfIndex, build_idf_index
+
+
+@pytest.fixture(scope="module")
+def docs(text, med_text, long_text):
+    texts = [text, med_text, long_text] * 4
+    return [(f"doc-{i}", t) for i, t in enumerate(texts)]
+
+
+def interrupted(docs, after):
+    for n, doc in enumerate(docs):
+        if n == after:
+            raise RuntimeError("preempted")
+        yield doc
+
+
+def read_chunks(out_dir):
+    return {
+        name: open(os.path.join(out_dir, name)).read()
+        for name in sorted(os.listdir(out_dir))
+        if name.startswith("chunk-")
+    }
+
+
+def test_resume_matches_clean_run(tmp_path, docs):
+    rake = Rake(max_kw=5)
+    clean, resumed = str(tmp_path / "clean"), str(tmp_path / "resumed")
+    run_corpus(docs, clean, rake, chunk_size=5)
+
+    with pytest.raises(RuntimeError):
+        run_corpus(interrupted(docs, 7), resumed, rake, chunk_size=5)
+    assert sorted(os.listdir(resumed)) == [chunk_name(0), "manifest.json"]
+
+    # completed chunks are skipped; their texts are never looked at again
+    garbled = [(docid, "garbled") for docid, _ in docs[:5]] + docs[5:]
+    manifest = run_corpus(garbled, resumed, rake, chunk_size=5)
+    assert manifest["finished"]
+    assert read_chunks(resumed) == read_chunks(clean)
+
+    results = list(iter_results(resumed))
+    assert [docid for docid, _ in results] == [docid for docid, _ in docs]
+    assert results[1][1] == [list(kw) for kw in rake(docs[1][1])]
+
+
+def test_processes(tmp_path, docs):
+    serial, pooled = str(tmp_path / "serial"), str(tmp_path / "pooled")
+    run_corpus(docs, serial, chunk_size=4)
+    run_corpus(docs, pooled, chunk_size=4, max_workers=2)
+    assert read_chunks(serial) == read_chunks(pooled)
+
+
+def test_compact(tmp_path, docs):
+    plain, compact = str(tmp_path / "plain"), str(tmp_path / "compact")
+    run_corpus(docs, plain, chunk_size=4)
+    run_corpus(docs, compact, Rake(compact=True), chunk_size=4)
+    assert read_chunks(plain) == read_chunks(compact)
+
+
+def test_settings_mismatch(tmp_path, docs):
+    out_dir = str(tmp_path / "run")
+    run_corpus(docs[:2], out_dir, chunk_size=5)
+    with pytest.raises(ValueError):
+        run_corpus(docs, out_dir, chunk_size=6)
+    with pytest.raises(ValueError):
+        run_corpus(docs, out_dir, Rake(kw_only=True), chunk_size=5)
+    with pytest.raises(ValueError):
+        run_corpus(docs, out_dir, Rake(merge_variants=True), chunk_size=5)
+
+    idf_path = str(tmp_path / "corpus.idf")
+    build_idf_index([text for _, text in docs], idf_path)
+    with IdfIndex(idf_path) as index:
+        with pytest.raises(ValueError):
+            run_corpus(docs, out_dir, Rake(idf_index=index), chunk_size=5)
+
+        idf_dir = str(tmp_path / "idf_run")
+        run_corpus(docs[:2], idf_dir, Rake(idf_index=index), chunk_size=5)
+        with pytest.raises(ValueError):
+            rake = Rake(idf_index=index, idf_weight=0.5)
+            run_corpus(docs, idf_dir, rake, chunk_size=5)
+        run_corpus(docs, idf_dir, Rake(idf_index=index), chunk_size=5)
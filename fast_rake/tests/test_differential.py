@@ -0,0 +1,34 @@
+"""
+Backends against the frozen reference
+"""
+import pytest
+
+from fast_rake.oracle import (
+    adversarial_texts,
+    backends,
+    compare,
+    reference_rake,
+)
+
+N_TEXTS = {"document-parallel": 20}
+
+
+def test_reference_known_answer(text, smart_all, nltk_all):
+    assert reference_rake(text, "smart") == smart_all
+    assert reference_rake(text, "nltk") == nltk_all
+
+
+def test_generator_is_reproducible():
+    assert list(adversarial_texts(5, seed=1)) == list(adversarial_texts(5, 1))
+    assert any("|" in t for t in adversarial_texts(50))
+
+
+@pytest.mark.parametrize("backend", backends())
+@pytest.mark.parametrize("stop_name", ["google", "nltk", "sklearn", "smart"])
+def test_backend_matches_reference(backend, stop_name):
+    n_texts = N_TEXTS.get(backend, 100)
+    texts = list(adversarial_texts(n_texts, seed=len(stop_name)))
+    report = compare(backend, texts, stop_name)
+    assert report["texts"] > 0
+    assert not report["mismatches"], report["mismatches"][0]
+    assert report["speedup"] > 0.0
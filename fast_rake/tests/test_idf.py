@@ -0,0 +1,56 @@
+"""
+IDF-aware scoring
+"""
+import pytest
+
+from fast_rake import Rake
+from fast_rake.idf import IdfIndex, build_idf_index, phrase_hash
+
+BOILER = "Subscribe to our daily newsletter. "
+
+
+@pytest.fixture(scope="module")
+def idf_path(tmp_path_factory, text, med_text):
+    path = str(tmp_path_factory.mktemp("idf") / "corpus.idf")
+    docs = [BOILER + t for t in (text, med_text, "Eels are fish.")]
+    build_idf_index(docs + ["", 12345], path)
+    return path
+
+
+def test_lookup(idf_path):
+    with IdfIndex(idf_path) as index:
+        assert index.n_docs == 5
+        assert "DAILY NEWSLETTER" in index
+        assert "hovercraft" not in index
+        assert index.idf("daily newsletter") < index.idf("natural numbers")
+        assert index.idf("hovercraft") == index.default_idf
+
+
+def test_boilerplate_demoted(idf_path, text):
+    doc = BOILER + text
+    plain = Rake(kw_only=True)(doc)
+    weighted = Rake(kw_only=True, idf_index=IdfIndex(idf_path))(doc)
+    assert weighted.index("daily newsletter") > plain.index("daily newsletter")
+
+
+def test_zero_weight(idf_path, text):
+    rake = Rake(idf_index=IdfIndex(idf_path), idf_weight=0.0)
+    assert rake(text) == Rake()(text)
+
+
+def test_bad_weight():
+    with pytest.raises(ValueError):
+        Rake(idf_weight=1.5)
+
+
+def test_not_an_index(tmp_path):
+    path = tmp_path / "junk.idf"
+    path.write_bytes(b"\0" * 64)
+    with pytest.raises(ValueError):
+        IdfIndex(str(path))
+
+
+def test_non_ascii_bytes_hash():
+    assert phrase_hash("CAFÉ SOCIETY") == phrase_hash("café society")
+    assert phrase_hash("CAFÉ SOCIETY".encode()) == phrase_hash("café society")
+    assert phrase_hash(b"\xff ok") == phrase_hash(b"\xff OK")
@@ -0,0 +1,81 @@
+"""
+Inverted keyword index
+"""
+import os
+
+import pytest
+
+from fast_rake import Rake
+from fast_rake.index import (
+    IndexReader,
+    IndexWriter,
+    index_documents,
+    merge_segments,
+)
+
+
+@pytest.fixture
+def docs(text, med_text, long_text):
+    return [text, med_text, long_text, text + " Eels are fish."] * 3
+
+
+def assert_postings(actual, expected):
+    assert [d for d, _ in actual] == [d for d, _ in expected]
+    assert [s for _, s in actual] == pytest.approx([s for _, s in expected])
+
+
+def expected_postings(docs, phrase):
+    rake = Rake()
+    postings = list()
+    for doc_id, doc in enumerate(docs):
+        scores = [s for kw, s in rake(doc) if kw.lower() == phrase.lower()]
+        if scores:
+            postings.append((doc_id, max(scores)))
+    return postings
+
+
+@pytest.mark.parametrize(
+    "phrase", ["minimal generating sets", "Kaggle", "eels", "compatibility"]
+)
+def test_segments_and_merge(tmp_path, docs, phrase):
+    index_dir = str(tmp_path / "ix")
+    ids = index_documents(docs[:5], index_dir, max_buffer_docs=2)
+    assert ids == range(0, 5)
+    assert index_documents(docs[5:], index_dir) == range(5, len(docs))
+
+    expected = expected_postings(docs, phrase)
+    assert expected
+    with IndexReader(index_dir) as reader:
+        assert len(reader.segments) == 4
+        assert_postings(reader.lookup(phrase), expected)
+
+    merge_segments(index_dir)
+    assert len([f for f in os.listdir(index_dir) if f.endswith(".fri")]) == 1
+    with IndexReader(index_dir) as reader:
+        assert_postings(reader.lookup(phrase), expected)
+        assert phrase.upper() in reader
+        assert reader.lookup("hovercraft") == []
+
+
+def test_kw_only_and_large_ids(tmp_path):
+    index_dir = str(tmp_path / "ix")
+    with IndexWriter(index_dir) as writer:
+        writer.add(3, ["eels", "lifeboat"])
+        writer.add(1_000_000, ["eels"])
+    with IndexReader(index_dir) as reader:
+        assert reader.lookup("eels") == [(3, 1.0), (1_000_000, 1.0)]
+
+
+def test_empty_index(tmp_path):
+    with IndexReader(str(tmp_path)) as reader:
+        assert reader.lookup("eels") == []
+
+
+def test_non_ascii_case_folding(tmp_path):
+    index_dir = str(tmp_path / "ix")
+    with IndexWriter(index_dir) as writer:
+        writer.add(0, [("CAFÉ SOCIETY".encode(), 2.0)])
+        writer.add(1, [("café society", 3.0)])
+    with IndexReader(index_dir) as reader:
+        assert reader.lookup("Café Society") == [(0, 2.0), (1, 3.0)]
+        assert "CAFÉ SOCIETY".encode() in reader
@@ -0,0 +1,53 @@
+"""
+Intra-document parallelism
+"""
+import random
+
+import pytest
+
+from fast_rake import Rake
+from fast_rake.parallel import extract_document, sentence_spans
+
+
+def test_spans_match_serial_split():
+    splitter = Rake()._sentence_splitter
+    rng = random.Random(7)
+    alphabet = ["a", "b", " ", "-", "\t", ".", ",", " - ", "–", "'"]
+    for _ in range(300):
+        text = "".join(rng.choices(alphabet, k=rng.randint(0, 60)))
+        expected = splitter.split(text)
+        for n_chunks in range(2, 8):
+            spans = sentence_spans(text, splitter, n_chunks)
+            pieces = [splitter.split(text[s:e]) for s, e in spans]
+            assert sum(pieces, []) == expected, (text, spans)
+
+
+@pytest.mark.parametrize(
+    "kwargs", [dict(), dict(ngram_range=(1, 2), kw_only=True, max_kw=25)]
+)
+def test_identical_to_serial(long_text, med_text, kwargs):
+    text = " ".join([long_text, med_text] * 40)
+    rake = Rake(**kwargs)
+    expected = rake(text)
+    result = extract_document(rake, text, max_workers=3, min_chunk_chars=1000)
+    assert result == expected
+
+
+@pytest.mark.parametrize("kwargs", [dict(), dict(ngram_range=(1, 1))])
+def test_compact_offsets(long_text, med_text, kwargs):
+    text = " ".join([long_text, med_text] * 40)
+    rake = Rake(compact=True, **kwargs)
+    expected = rake(text)
+    result = extract_document(rake, text, max_workers=3, min_chunk_chars=1000)
+    assert result == expected
+    assert result.offsets() == expected.offsets()
+
+
+def test_no_ngrams(text):
+    rake = Rake(ngram_range=(9, 10))
+    assert extract_document(rake, text * 10, 2, min_chunk_chars=100) == []
+
+
+def test_small_document_is_serial(text):
+    rake = Rake()
+    assert extract_document(rake, text, max_workers=4) == rake(text)
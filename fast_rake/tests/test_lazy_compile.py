@@ -0,0 +1,40 @@
+"""
+Deferred stopword compilation
+"""
+import os
+import subprocess
+import sys
+
+import fast_rake
+from fast_rake import Rake
+
+
+def test_compiled_on_first_call(text):
+    rake = Rake(stopword_name="sklearn")
+    assert rake._stop_re is None
+    assert len(rake(text)) > 0
+    assert rake._stop_re is not None
+
+
+def test_precompile_shares_matcher():
+    rake_a = Rake(stopword_name="nltk", custom_stopwords=["eels"])
+    rake_b = Rake(stopword_name="nltk", custom_stopwords=["eels"])
+    assert rake_a.precompile()._stop_re is rake_b.precompile()._stop_re
+    rake_c = Rake(stopword_name="nltk").precompile()
+    assert rake_a._stop_re is not rake_c._stop_re
+
+
+def test_import_skips_process_pools():
+    code = (
+        "import sys, fast_rake; "
+        "print(any(m == 'multiprocessing' or m.startswith("
+        "('fast_rake.parallel', 'multiprocessing.')) for m in sys.modules))"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=os.path.dirname(os.path.dirname(fast_rake.__file__)),
+    )
+    assert out.stdout.strip() == "False"
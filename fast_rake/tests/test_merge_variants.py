@@ -0,0 +1,36 @@
+"""
+Near-duplicate candidate merging
+"""
+import pytest
+
+from fast_rake import Rake
+from fast_rake.normalize import light_stem, merge_variants
+
+
+@pytest.mark.parametrize(
+    "word, stem",
+    [
+        ("Models", "model"),
+        ("studies", "study"),
+        ("boxes", "box"),
+        ("classes", "class"),
+        ("corpus", "corpus"),
+        ("analysis", "analysis"),
+        ("gas", "gas"),
+    ],
+)
+def test_light_stem(word, stem):
+    assert light_stem(word) == stem
+
+
+def test_merge_keeps_best():
+    scores = {"ML model": 4.0, "ml models": 5.0, "model": 1.0, "Model": 2.0}
+    assert merge_variants(scores) == {"ml models": 5.0, "Model": 2.0}
+
+
+def test_rake_merge(text):
+    plain = Rake(kw_only=True)(text)
+    merged = Rake(kw_only=True, merge_variants=True)(text)
+    assert "Compatibility" in plain and "compatibility" in plain
+    assert len(merged) < len(plain)
+    assert len({kw.lower() for kw in merged}) == len(merged)
@@ -0,0 +1,47 @@
+"""
+Several output configurations in one pass
+"""
+import pytest
+
+from fast_rake import MultiRake, Rake
+
+
+@pytest.fixture(scope="module")
+def specs():
+    return [
+        Rake(),
+        Rake(ngram_range=(1, 2), max_kw=10),
+        Rake(kw_only=True),
+        Rake(ngram_range=(1, 2), top_percent=0.5, kw_only=True),
+        Rake(ngram_range=(7, 9)),
+    ]
+
+
+@pytest.mark.parametrize("doc", ["text", "med_text", "long_text"])
+def test_same_as_separate(specs, doc, request):
+    doc = request.getfixturevalue(doc)
+    assert MultiRake(specs)(doc) == [spec(doc) for spec in specs]
+
+
+def test_bad_input(specs):
+    assert MultiRake(specs)("  ") == [[]] * len(specs)
+
+
+def test_mismatched_stopwords():
+    with pytest.raises(ValueError):
+        MultiRake([Rake(), Rake(stopword_name="nltk")])
+    with pytest.raises(ValueError):
+        MultiRake([])
+
+
+def test_compact_spec(long_text):
+    specs = [Rake(), Rake(compact=True, ngram_range=(1, 2))]
+    results = MultiRake(specs)(long_text)
+    assert [type(r) for r in results] == [type(s(long_text)) for s in specs]
+    assert results == [spec(long_text) for spec in specs]
+    assert results[1].offsets() == specs[1](long_text).offsets()
+
+
+def test_ngram_warning():
+    with pytest.warns(UserWarning, match="ngram_range"):
+        assert MultiRake([Rake(ngram_range=(7, 9))])("My lifeboat.") == [[]]
@@ -0,0 +1,67 @@
+"""
+Per-tenant stopword overlays
+"""
+import pytest
+
+from fast_rake import Rake
+
+CUSTOMS = ["minimal", "Linear", "kaggle"]
+
+
+@pytest.mark.parametrize("stop_name", ["google", "nltk", "sklearn", "smart"])
+def test_same_as_compiled(text, long_text, stop_name):
+    compiled = Rake(stopword_name=stop_name, custom_stopwords=CUSTOMS)
+    overlay = Rake(
+        stopword_name=stop_name,
+        custom_stopwords=CUSTOMS,
+        stopword_overlay=True,
+    )
+    for doc in (text, long_text):
+        assert overlay(doc) == compiled(doc)
+        expected = [(kw.encode(), score) for kw, score in compiled(doc)]
+        assert overlay(doc.encode()) == expected
+
+
+def test_shares_base_matcher(text):
+    base = Rake(stopword_name="nltk").precompile()
+    tenants = [
+        Rake(
+            stopword_name="nltk",
+            custom_stopwords=[f"t{i}", "eels"],
+            stopword_overlay=True,
+            sentence_cache=8,
+        )
+        for i in range(5)
+    ]
+    for tenant in tenants:
+        assert tenant.precompile()._stop_re is base._stop_re
+        assert "eels" not in tenant(text + " Eels are here.")
+
+
+def test_tokens(text):
+    rake = Rake(custom_stopwords=CUSTOMS, stopword_overlay=True)
+    tokens = [text.replace(".", " .").split()]
+    assert not any("minimal" in kw for kw, _ in rake.extract_sentences(tokens))
+
+
+def test_multi_token_rejected():
+    with pytest.raises(ValueError):
+        Rake(custom_stopwords=["new york"], stopword_overlay=True)
+
+
+@pytest.mark.parametrize(
+    "doc", ["great lifeboat/Full boat", "c+full-time full+eels", "FULL."]
+)
+def test_word_boundaries(doc):
+    compiled = Rake(custom_stopwords=["full"])
+    overlay = Rake(custom_stopwords=["full"], stopword_overlay=True)
+    assert overlay(doc) == compiled(doc)
+
+
+def test_compiled_lazily(text):
+    rake = Rake(custom_stopwords=["minimal"], stopword_overlay=True)
+    assert rake._overlay_re is None and rake._overlay_re_b is None
+    rake(text)
+    assert rake._overlay_re is not None and rake._overlay_re_b is None
+    rake(text.encode())
+    assert rake._overlay_re_b is not None
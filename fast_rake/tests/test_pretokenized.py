@@ -0,0 +1,57 @@
+"""
+Pre-split and pre-tokenized input
+"""
+import re
+import warnings
+from collections import namedtuple
+
+import pytest
+
+from fast_rake import Rake
+
+Token = namedtuple("Token", "text")
+
+
+class Doc:
+    def __init__(self, sents):
+        self.sents = [[Token(t) for t in s] for s in sents]
+
+
+def tokenize(text):
+    sents = re.split(r"(?<=\.)\s+", text)
+    return [re.findall(r"[\w-]+|[^\w\s]", s) for s in sents]
+
+
+def test_sentences_match_raw(text):
+    rake = Rake()
+    sents = re.split(r"(?<=\.)\s+", text)
+    assert rake.extract_sentences(sents) == rake(text)
+
+
+def test_tokens_match_raw(text, med_text):
+    rake = Rake(kw_only=True)
+    for doc in (text, med_text):
+        assert rake.extract_sentences(tokenize(doc)) == rake(doc)
+
+
+def test_doc_protocol(text):
+    rake = Rake(ngram_range=(2, 3))
+    assert rake.extract_sentences(Doc(tokenize(text))) == rake(text)
+
+
+def test_stopwords_only():
+    rake = Rake()
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        assert rake.extract_sentences([["of", "the", ".", "\n"]]) == []
+    rake = Rake(ngram_range=(7, 9))
+    with pytest.warns(UserWarning, match="ngram_range"):
+        assert rake.extract_sentences(["My lifeboat."]) == []
+
+
+def test_dash_token_is_delimiter():
+    rake = Rake()
+    text = "Deep learning - neural networks rock."
+    tokens = ["Deep", "learning", "-", "neural", "networks", "rock", "."]
+    assert rake.extract_sentences([tokens]) == rake(text)
+    assert rake.extract_sentences([text]) == rake(text)
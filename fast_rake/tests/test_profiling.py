@@ -0,0 +1,41 @@
+"""
+Profiling report
+"""
+import json
+
+from fast_rake import Rake
+from fast_rake.profiling import format_report, profile_corpus, read_corpus
+
+
+def test_report(tmp_path, text, med_text, long_text):
+    docs = [text, med_text, long_text, "   "]
+    report = profile_corpus(
+        docs,
+        Rake(stopword_name="nltk", ngram_range=(1, 2)),
+        top_n=3,
+        repeats=1,
+        sample_size=5,
+    )
+    assert report["corpus"]["sampled_sentences"] == 5
+    assert report["corpus"]["sentences"] > 5
+    assert report["corpus"]["docs"] == 3
+    assert report["corpus"]["chars"] == len(text + med_text + long_text)
+    assert all(secs > 0 for secs in report["stages"].values())
+    assert set(report["stopword_lists"]) == set(Rake().supported_stopwords)
+    assert report["stopword_lists"]["nltk"]["relative"] == 1.0
+
+    slowest = report["slowest"]
+    assert len(slowest) == 3
+    assert [s["seconds"] for s in slowest] == sorted(
+        (s["seconds"] for s in slowest), reverse=True
+    )
+    assert all(s["matches"] >= len(s["top_matches"]) for s in slowest)
+    assert "slowest sentences" in format_report(report)
+    json.dumps(report)
+
+
+def test_read_corpus(tmp_path, text):
+    (tmp_path / "a.txt").write_text(text + "\n" + text)
+    (tmp_path / "b.csv").write_text("not read")
+    assert len(list(read_corpus([str(tmp_path)]))) == 1
+    assert len(list(read_corpus([str(tmp_path / "a.txt")], lines=True))) == 2
@@ -0,0 +1,39 @@
+"""
+Length-aware scheduling
+"""
+from fast_rake import Rake
+from fast_rake.schedule import CostModel, map_scheduled, plan_batches
+
+
+def test_plan_batches():
+    lengths = [10] * 200 + [50000, 20000] + [10] * 50
+    model = CostModel(1e-4, 1e-6)
+    batches = plan_batches(lengths, n_workers=4, cost_model=model)
+    flat = sorted(idx for batch in batches for idx in batch)
+    assert flat == list(range(len(lengths)))
+    assert batches[0] == [200] and batches[1] == [201]
+    costs = [sum(model.cost(lengths[i]) for i in b) for b in batches]
+    assert costs == sorted(costs, reverse=True)
+    assert max(len(b) for b in batches) > 10
+
+
+def test_calibrate():
+    model = CostModel.calibrate(Rake(), sizes=(100, 2000), repeats=1)
+    assert model.cost(100000) > model.cost(100) >= 0.0
+    assert CostModel.from_dict(model.to_dict()).per_char == model.per_char
+
+
+def test_map_scheduled(text, med_text, long_text):
+    docs = [text, long_text * 20, "", med_text] * 5
+    rake = Rake(max_kw=5)
+    results, report = map_scheduled(
+        rake, docs, max_workers=2, cost_model=CostModel(1e-4, 1e-6)
+    )
+    assert results == [rake(doc) for doc in docs]
+    assert sum(w["docs"] for w in report["workers"].values()) == len(docs)
+    for stats in report["workers"].values():
+        assert 0.0 < stats["utilization"] <= 1.0 + 1e-6
+
+
+def test_empty():
+    assert plan_batches([], 4, CostModel(0.0, 1.0)) == []
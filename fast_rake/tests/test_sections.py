@@ -0,0 +1,61 @@
+"""
+Sectioned extraction
+"""
+import pytest
+
+from fast_rake import Rake
+
+
+@pytest.fixture
+def sections(text, med_text, long_text):
+    return [
+        ("title", "Google buys Kaggle platform"),
+        ("abstract", text),
+        ("body", med_text + " " + long_text),
+        ("empty", "  "),
+    ]
+
+
+@pytest.mark.parametrize(
+    "kwargs", [dict(), dict(ngram_range=(1, 2), max_kw=20), dict(kw_only=True)]
+)
+def test_one_pass(sections, kwargs):
+    rake = Rake(**kwargs)
+    document, by_section = rake.extract_sections(sections)
+    assert list(by_section) == ["title", "abstract", "body", "empty"]
+    for label, text in sections[:3]:
+        assert by_section[label] == rake(text)
+    assert by_section["empty"] == []
+    joined = ". ".join(text for _, text in sections[:3])
+    assert document == rake(joined)
+
+
+def test_weights(sections):
+    rake = Rake()
+    sections = [("title", "Quantum computing breakthrough")] + sections[1:]
+    unweighted = dict(rake.extract_sections(sections)[0])
+    weighted = dict(
+        rake.extract_sections(dict(sections), weights={"title": 10.0})[0]
+    )
+    phrase = "Quantum computing breakthrough"
+    assert weighted[phrase] == pytest.approx(10 * unweighted[phrase])
+    # phrases only in unweighted sections keep their scores
+    assert weighted["smooth muscle cells"] == unweighted["smooth muscle cells"]
+    assert max(weighted, key=weighted.get) == phrase
+
+    with pytest.raises(ValueError):
+        rake.extract_sections(sections, weights={"body": 0})
+
+
+def test_compact_sections(sections):
+    rake = Rake(compact=True)
+    document, by_section = rake.extract_sections(sections)
+    assert isinstance(document, list)
+    assert by_section["abstract"] == Rake()(sections[1][1])
+
+
+def test_compact_offsets_with_ngram_range():
+    text = "Electric eels travel south. eels, lifeboat."
+    rake = Rake(compact=True, ngram_range=(1, 1))
+    _, by_section = rake.extract_sections({"body": text})
+    assert by_section["body"].offsets() == rake(text).offsets()
@@ -0,0 +1,48 @@
+"""
+Sentence-level candidate memoization
+"""
+import pickle
+
+import pytest
+
+from fast_rake import Rake
+from fast_rake.cache import SentenceCache
+from fast_rake.parallel import map_processes
+
+FOOTER = "We use cookies to improve your experience. All rights reserved. "
+
+
+def test_same_results(text, med_text, long_text):
+    plain, cached = Rake(), Rake(sentence_cache=64)
+    docs = [FOOTER + d for d in (text, med_text, long_text, text)]
+    assert [cached(d) for d in docs] == [plain(d) for d in docs]
+    info = cached.cache_info()
+    assert info["hits"] >= 3 * 2 and info["hit_rate"] > 0.0
+    assert info["size"] <= 64
+
+
+def test_bounded():
+    rake = Rake(sentence_cache=2)
+    rake("one eel. two eels. three eels. four eels.")
+    assert rake.cache_info()["size"] == 2
+
+
+def test_bytes_and_str_kept_apart(text):
+    rake = Rake(sentence_cache=128)
+    assert [kw.decode() for kw, _ in rake(text.encode())] == [
+        kw for kw, _ in rake(text)
+    ]
+
+
+def test_pickles_empty(text):
+    rake = Rake(sentence_cache=16)
+    rake(text)
+    clone = pickle.loads(pickle.dumps(rake))
+    assert clone.cache_info()["size"] == 0
+    assert map_processes(rake, [text] * 3, 2) == [rake(text)] * 3
+
+
+def test_no_cache():
+    assert Rake().cache_info() == dict()
+    with pytest.raises(ValueError):
+        SentenceCache(0)
@@ -0,0 +1,120 @@
+"""
+Local extraction service
+"""
+import json
+import queue
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from fast_rake import Rake
+from fast_rake.serve import ExtractionService, make_server
+
+CONFIGS = {
+    "smart": {"stopword_name": "smart"},
+    "nltk2": {"stopword_name": "nltk", "ngram_range": (1, 2), "kw_only": True},
+    "compact": {"compact": True},
+}
+
+
+@pytest.fixture(scope="module")
+def base_url():
+    with ExtractionService(CONFIGS, n_workers=1, max_wait=0.02) as service:
+        httpd = make_server(service, port=0)
+        thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+        thread.start()
+        yield "http://{}:{}".format(*httpd.server_address)
+        httpd.shutdown()
+        httpd.server_close()
+
+
+def post(url, body):
+    request = urllib.request.Request(
+        url, data=json.dumps(body).encode("utf-8"), method="POST"
+    )
+    with urllib.request.urlopen(request, timeout=30) as resp:
+        return json.loads(resp.read())
+
+
+def get(url):
+    with urllib.request.urlopen(url, timeout=30) as resp:
+        return json.loads(resp.read())
+
+
+def test_concurrent_requests(base_url, text, med_text, long_text):
+    docs = [text, med_text, long_text] * 4
+    results = [None] * len(docs)
+
+    def call(idx):
+        results[idx] = post(base_url + "/extract", {"text": docs[idx]})
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(12)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    rake = Rake()
+    for doc, result in zip(docs, results):
+        assert [tuple(kw) for kw in result["keywords"]] == rake(doc)
+
+    stats = get(base_url + "/stats")
+    assert stats["documents"] >= len(docs)
+    assert stats["batch_size"]["max"] > 1
+    assert set(stats["latency_ms"]) == {"p50", "p90", "p99"}
+
+
+def test_batch_request(base_url, text, med_text):
+    body = {"texts": [text, med_text], "config": "nltk2"}
+    rake = Rake(stopword_name="nltk", ngram_range=(1, 2), kw_only=True)
+    assert post(base_url + "/extract", body)["results"] == [
+        rake(text),
+        rake(med_text),
+    ]
+
+
+def test_compact_config(base_url, text):
+    body = {"text": text, "config": "compact"}
+    keywords = post(base_url + "/extract", body)["keywords"]
+    assert [tuple(kw) for kw in keywords] == Rake()(text)
+
+
+@pytest.mark.parametrize(
+    "body, status", [({"text": "x", "config": "nope"}, 400), ({}, 400)]
+)
+def test_bad_requests(base_url, body, status):
+    with pytest.raises(urllib.error.HTTPError) as err:
+        post(base_url + "/extract", body)
+    assert err.value.code == status
+    assert get(base_url + "/healthz") == {"status": "ok"}
+
+
+def test_backpressure():
+    # marked running without a batcher, so nothing drains the queue
+    service = ExtractionService(CONFIGS, max_queue=2)
+    service._running.set()
+    service.submit("one")
+    service.submit("two")
+    with pytest.raises(queue.Full):
+        service.submit("three")
+    assert service.stats()["rejected"] == 1
+    assert service.stats()["queue_depth"] == 2
+
+
+def test_not_running():
+    service = ExtractionService(CONFIGS)
+    with pytest.raises(RuntimeError):
+        service.submit("one")
+    assert service.stats()["queue_depth"] == 0
+    httpd = make_server(service, port=0)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    try:
+        url = "http://{}:{}/extract".format(*httpd.server_address)
+        with pytest.raises(urllib.error.HTTPError) as err:
+            post(url, {"text": "one"})
+        assert err.value.code == 503
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
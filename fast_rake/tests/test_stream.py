@@ -0,0 +1,88 @@
+"""
+Bounded-memory heavy hitters
+"""
+import math
+import random
+from collections import Counter
+
+import pytest
+
+from fast_rake.stream import SpaceSaving
+
+
+@pytest.fixture(scope="module")
+def stream():
+    rng = random.Random(3)
+    vocab = [f"kw{i}" for i in range(2000)]
+    weights = [1.0 / (i + 1) for i in range(len(vocab))]
+    return [
+        [(kw, 2.0) for kw in rng.choices(vocab, weights, k=10)]
+        for _ in range(2000)
+    ]
+
+
+def check_bounds(summary, exact):
+    for kw, count, error, _ in summary.top():
+        assert count - error - 1e-9 <= exact[kw] <= count + 1e-9
+    for kw, n in exact.items():
+        if n > summary.error_bound:
+            assert kw in summary
+
+
+def test_bounds(stream):
+    summary = SpaceSaving(capacity=100)
+    exact = Counter()
+    for doc in stream:
+        summary.update(doc)
+        exact.update(kw for kw, _ in doc)
+    assert len(summary) == 100
+    assert summary.total == sum(exact.values())
+    check_bounds(summary, exact)
+    top = [kw for kw, *_ in summary.top(3)]
+    assert top == [kw for kw, _ in exact.most_common(3)]
+    assert summary.top(1)[0][3] == pytest.approx(2.0 * exact[top[0]])
+
+
+def test_merge(stream):
+    left, right = SpaceSaving(100), SpaceSaving(100)
+    for doc in stream[:1000]:
+        left.update(doc)
+    for doc in stream[1000:]:
+        right.update([kw for kw, _ in doc])
+    merged = left.merge(right)
+    exact = Counter(kw for doc in stream for kw, _ in doc)
+    assert len(merged) == 100
+    check_bounds(merged, exact)
+
+
+def test_decay():
+    summary = SpaceSaving(capacity=10, decay=0.5)
+    for _ in range(20):
+        summary.update(["old"])
+    for _ in range(400):
+        summary.tick()
+        summary.update(["new"])
+    assert summary.top(1)[0][0] == "new"
+    assert summary.top()[1][1] < 1e-6
+    assert summary.total == pytest.approx(2.0)
+
+
+@pytest.mark.parametrize("n", [1100, 10**9])
+def test_long_gap(n):
+    summary = SpaceSaving(capacity=10, decay=0.5)
+    summary.update(["old"] * 3)
+    summary.tick(300)
+    summary.update(["mid"])
+    summary.tick(n)
+    summary.update(["new", "new"])
+    assert math.isfinite(summary._scale)
+    assert summary.top(1) == [("new", 2.0, 0.0, 0.0)]
+    assert summary.total == pytest.approx(2.0)
+    summary.tick(2)
+    assert summary.top(1)[0][1] == pytest.approx(0.5)
+
+
+@pytest.mark.parametrize("kwargs", [dict(capacity=0), dict(decay=0.0)])
+def test_bad_args(kwargs):
+    with pytest.raises(ValueError):
+        SpaceSaving(**kwargs)
@@ -0,0 +1,63 @@
+"""
+Sharing a Rake between threads
+"""
+import threading
+
+import pytest
+
+from fast_rake import Rake
+from fast_rake.parallel import map_processes, map_threads
+
+
+@pytest.fixture(scope="module")
+def docs(text, med_text, long_text):
+    return [text, med_text, long_text, "", "My lifeboat is full of eels."] * 8
+
+
+def test_stress_shared_instance(docs):
+    rake = Rake(stopword_name="smart", max_kw=10)
+    expected = [rake(d) for d in docs]
+    errors = list()
+    barrier = threading.Barrier(8)
+
+    def hammer():
+        barrier.wait()
+        for _ in range(5):
+            if [rake(d) for d in docs] != expected:
+                errors.append(threading.current_thread().name)
+
+    threads = [threading.Thread(target=hammer) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not errors
+
+
+def test_lazy_compile_race(text):
+    rake = Rake(stopword_name="google", custom_stopwords=["race"])
+    barrier = threading.Barrier(8)
+    results = list()
+
+    def first_call():
+        barrier.wait()
+        results.append(rake(text))
+
+    threads = [threading.Thread(target=first_call) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(results) == 8
+    assert all(r == results[0] for r in results)
+
+
+def test_map_threads_order(docs):
+    rake = Rake(kw_only=True)
+    assert map_threads(rake, docs, max_workers=4) == [rake(d) for d in docs]
+
+
+def test_map_processes_order(docs):
+    rake = Rake(ngram_range=(1, 2))
+    expected = [rake(d) for d in docs]
+    assert map_processes(rake, docs, max_workers=2, chunksize=3) == expected
@@ -15,7 +15,8 @@ with open(path.join(here, "README.md"), encoding="utf-8") as f:
 setup(
     name="fast-rake",
     version=__version__,
-    python_requires=">=3.6",
+    python_requires=">=3.8",
+    extras_require={"numpy": ["numpy"]},
     packages=find_packages(exclude=["test*", "examples"]),
     include_package_data=False,
     zip_safe=False,
@@ -33,6 +34,6 @@ setup(
         "Intended Audience :: Developers",
         "Topic :: Natural Language :: English",
         "Topic :: Software Development :: Libraries :: Python Modules",
-        "Programming Language :: Python :: 3.6",
+        "Programming Language :: Python :: 3.8",
     ],
 )